@@ -0,0 +1,105 @@
+# bench_extract.py
+#
+# Parses a job-page corpus with every installed extractor backend, checks each
+# one against the BeautifulSoup reference and reports pages/sec.
+#
+# The checked-in fixtures (benchmarks/fixtures/naukri) are SYNTHETIC: hand-built
+# pages with Naukri's markup and class names, padded to a realistic size, that
+# share one description. They catch regressions in the extractors' logic but say
+# little about parser differences on real, malformed pages, and their pages/sec
+# are not representative. For that, run against pages the scraper archived:
+#
+#   python benchmarks/bench_extract.py [--rounds 20] [--fixtures DIR]
+#   python benchmarks/bench_extract.py --archive [--limit 200] [--role ROLE]
+
+import argparse
+import glob
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_utils import get_raw_pages
+from html_archive import load_page
+from html_extractors import EXTRACTORS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "naukri")
+
+
+def load_corpus(fixtures_dir):
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            url = f"https://www.naukri.com/job-listings-{os.path.basename(path)[:-5]}"
+            corpus.append((url, f.read()))
+    return corpus
+
+
+def load_archive(role=None, limit=None):
+    # Real pages saved by nakuri_scraper.py (see html_archive), run from the repo root
+    try:
+        pages = get_raw_pages(role)[:limit]
+    except sqlite3.OperationalError:
+        return []  # database predates the raw-page archive
+    corpus = []
+    for url, _, path in pages:
+        try:
+            corpus.append((url, load_page(path)))
+        except OSError as e:
+            print(f"⚠️ Skipping {url}: {e}")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job-page extractor backends")
+    parser.add_argument("--rounds", type=int, default=20, help="passes over the corpus per backend")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of synthetic .html fixtures")
+    parser.add_argument("--archive", action="store_true", help="use real archived pages from jobs.db instead")
+    parser.add_argument("--role", help="with --archive: only pages crawled for this role")
+    parser.add_argument("--limit", type=int, help="with --archive: at most this many pages")
+    args = parser.parse_args()
+
+    if args.archive:
+        corpus = load_archive(args.role, args.limit)
+        if not corpus:
+            sys.exit("❌ No archived pages found (raw_pages in jobs.db is empty)")
+    else:
+        corpus = load_corpus(args.fixtures)
+        if not corpus:
+            sys.exit(f"❌ No .html fixtures found in {args.fixtures}")
+
+    total_mb = sum(len(html) for _, html in corpus) / 1e6
+    print(f"📄 {len(corpus)} pages ({total_mb:.1f} MB), {args.rounds} rounds per backend\n")
+
+    reference = [EXTRACTORS["bs4"](html, url) for url, html in corpus]
+    mismatches = 0
+    results = {}
+
+    for name, extractor in EXTRACTORS.items():
+        for (url, html), expected in zip(corpus, reference):
+            got = extractor(html, url)
+            if got != expected:
+                mismatches += 1
+                diff = {k: (expected[k], got[k]) for k in expected if expected[k] != got.get(k)}
+                print(f"❌ {name} differs from bs4 on {url}: {diff}")
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for url, html in corpus:
+                extractor(html, url)
+        elapsed = time.perf_counter() - start
+        results[name] = len(corpus) * args.rounds / elapsed
+
+    baseline = results["bs4"]
+    print(f"{'backend':<12}{'pages/sec':>12}{'speedup':>10}")
+    for name, rate in sorted(results.items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:<12}{rate:>12.1f}{rate / baseline:>9.1f}x")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
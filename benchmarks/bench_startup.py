@@ -0,0 +1,82 @@
+# bench_startup.py
+#
+# Profiles `import dashboard_app` with `python -X importtime` in fresh
+# interpreters. Fails when a module that belongs on the first-use path
+# (pandas, plotly.express, PDF rendering) is imported at startup again, or when
+# the import costs more than max_dash_ratio times the `dash` import measured in
+# the same runs (benchmarks/startup_baseline.json). Wall-clock milliseconds
+# differ too much between machines to be a gate, so they are only reported.
+#
+#   python benchmarks/bench_startup.py [--runs 5] [--top 10]
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+
+def import_profile():
+    # One fresh interpreter; returns {module: (self_us, cumulative_us)} in import order
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import dashboard_app"],
+        cwd=REPO_DIR, capture_output=True, text=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if proc.returncode != 0:
+        sys.exit(f"❌ import dashboard_app failed:\n{proc.stderr[-2000:]}")
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        profile[name.strip()] = (int(self_us), int(cumulative_us), len(name) - len(name.lstrip()))
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard_app import time")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to profile (median is used)")
+    parser.add_argument("--top", type=int, default=10, help="slowest direct imports to list")
+    args = parser.parse_args()
+
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    import_ms = statistics.median(p["dashboard_app"][1] for p in profiles) / 1000
+    # dash is imported inside every run and can't be deferred: it is the yardstick
+    ratio = statistics.median(p["dashboard_app"][1] / p["dash"][1] for p in profiles)
+
+    # Direct imports of dashboard_app sit one indent level below it
+    last = profiles[-1]
+    depth = last["dashboard_app"][2]
+    children = [(name, cumulative) for name, (_, cumulative, indent) in last.items() if indent == depth + 2]
+    print(f"📦 import dashboard_app: {import_ms:.0f} ms, {ratio:.2f}x the dash import (median of {args.runs})\n")
+    print(f"{'module':<36}{'cumulative ms':>14}")
+    for name, cumulative in sorted(children, key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{name:<36}{cumulative / 1000:>14.1f}")
+
+    failed = False
+    eager = [name for name in baseline["deferred_modules"] if any(name in p for p in profiles)]
+    if eager:
+        failed = True
+        print(f"\n❌ Imported at startup, should be on first use: {', '.join(eager)}")
+
+    if ratio > baseline["max_dash_ratio"]:
+        failed = True
+        print(f"\n❌ {ratio:.2f}x the dash import is over the {baseline['max_dash_ratio']}x limit")
+    else:
+        print(f"\n✅ Within {baseline['max_dash_ratio']}x the dash import")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
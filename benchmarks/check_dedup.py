@@ -0,0 +1,55 @@
+# check_dedup.py
+#
+# Regression check for dedup_jobs on real postings from cleaned_jobs.csv
+# (benchmarks/fixtures/dedup_cases.json): only the groups listed under
+# "duplicates" may share a cluster. The other rows used to be merged: Accenture
+# "Business Analyst" postings with different experience ranges and cities that
+# all carry the site's IEIL disclaimer as description, and postings with no
+# description at all.
+#
+#   python benchmarks/check_dedup.py [--cases FILE]
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_jobs import find_duplicate_clusters
+
+CASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "dedup_cases.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check duplicate clustering on known postings")
+    parser.add_argument("--cases", default=CASES_PATH)
+    args = parser.parse_args()
+
+    with open(args.cases, encoding="utf-8") as f:
+        cases = json.load(f)
+    rows = cases["rows"]
+
+    clusters = find_duplicate_clusters(*(
+        [row[field] for row in rows]
+        for field in ("id", "title", "company", "description", "experience", "location")
+    ))
+    got = {}
+    for row, cluster_id in zip(rows, clusters):
+        got.setdefault(cluster_id, set()).add(row["id"])
+
+    expected = {frozenset(group) for group in cases["duplicates"]}
+    expected |= {frozenset([row["id"]]) for row in rows if not any(row["id"] in g for g in expected)}
+    got = {frozenset(group) for group in got.values()}
+
+    for group in sorted(got - expected, key=min):
+        print(f"❌ Wrongly clustered together: {sorted(group)}")
+    for group in sorted(expected - got, key=min):
+        print(f"❌ Expected one cluster: {sorted(group)}")
+    if got != expected:
+        sys.exit(1)
+    print(f"✅ {len(rows)} postings, {len(got)} clusters as expected")
+
+
+if __name__ == "__main__":
+    main()
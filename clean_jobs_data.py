@@ -1,10 +1,15 @@
 # cleaned_jobs.py
 
+import os
 import sqlite3
 import pandas as pd
 import re
 from datetime import datetime, timedelta
 
+from db_utils import build_search_snapshot, save_weekly_rollups
+from dedup_jobs import find_duplicate_clusters
+from quantile_sketch import SegmentSketches
+
 # Connect to DB and load data
 conn = sqlite3.connect("jobs.db")
 df = pd.read_sql_query("SELECT * FROM jobs", conn)
@@ -33,7 +38,9 @@ def normalize_posted_date(p):
     return None
 
 if 'posted_date' in df.columns:
-    df['posted_date_cleaned'] = df['posted_date'].apply(normalize_posted_date)
+    # Native datetime64 plus a week key, so the dashboard never re-parses or re-buckets dates
+    df['posted_date_cleaned'] = pd.to_datetime(df['posted_date'].apply(normalize_posted_date))
+    df['posted_week'] = df['posted_date_cleaned'].dt.to_period('W').dt.start_time
 else:
     print("⚠️ 'posted_date' column not found. Skipping date normalization.")
 
@@ -146,6 +153,56 @@ def clean_skills(skills_str):
 
 df['clean_skills'] = df['skills'].apply(clean_skills)
 
+# --- Flag near-duplicate postings (same job under several roles, or reposted) ---
+df['dup_cluster_id'] = find_duplicate_clusters(
+    df['id'].tolist(), df['title'].tolist(), df['company'].tolist(), df['description'].tolist(),
+    df['experience'].tolist(), df['location'].tolist()
+)
+print(f"🧬 {df['dup_cluster_id'].nunique()} unique postings among {len(df)} rows")
+
+# --- Weekly rollups: today's snapshot of postings and salary per (role, week) ---
+if 'posted_week' in df.columns:
+    # Same population as the dashboard: postings without experience are never shown
+    rollups = (
+        df.dropna(subset=['role', 'posted_week', 'years_exp'])
+        .groupby(['role', 'posted_week'])
+        .agg(job_count=('id', 'size'), salary_sum=('avg_salary', 'sum'), salary_count=('avg_salary', 'count'))
+        .reset_index()
+    )
+    # Saved before the CSV is swapped in, so a reloading dashboard sees both together.
+    # With experience already required, salary_count is the "with salary" count too.
+    save_weekly_rollups(
+        datetime.today().date().isoformat(),
+        [(r.role, r.posted_week.date().isoformat(), int(r.job_count), float(r.salary_sum), int(r.salary_count),
+          int(r.salary_count))
+         for r in rollups.itertuples(index=False)]
+    )
+    print(f"📈 Saved {len(rollups)} weekly rollup rows")
+
+# --- Quantile sketches of salary and experience per (role, location) segment ---
+sketches = SegmentSketches()
+for row in df[['role', 'clean_location', 'avg_salary', 'years_exp']].itertuples(index=False):
+    # Same population as the dashboard, which never shows postings without experience
+    if pd.isna(row.role) or pd.isna(row.years_exp):
+        continue
+    locations = [loc.strip() for loc in str(row.clean_location).split(',') if loc.strip()]
+    sketches.update(row.role, locations, {
+        'avg_salary': row.avg_salary,
+        'years_exp': row.years_exp,
+        'years_exp_with_salary': None if pd.isna(row.avg_salary) else row.years_exp,
+    })
+sketches.save()
+print(f"📐 Saved quantile sketches for {len(sketches.segments)} role x location segments")
+
+# --- Keyword search index over exactly these rows (the dashboard's search box) ---
+# Written before the CSV, so a dashboard that picks up the new CSV finds its index
+search_cols = df[['url', 'title', 'description', 'skills']]
+search_rows = search_cols.astype(object).where(search_cols.notna(), None)
+build_search_snapshot(search_rows.itertuples(index=False, name=None))
+print(f"🔎 Built search index for {len(df)} postings")
+
 # --- Save cleaned data to CSV ---
-df.to_csv("cleaned_jobs.csv", index=False)
+# Write to a temp file and rename, so a running dashboard never reads a half-written file
+df.to_csv("cleaned_jobs.csv.tmp", index=False)
+os.replace("cleaned_jobs.csv.tmp", "cleaned_jobs.csv")
 print("✅ Cleaned data saved to cleaned_jobs.csv")
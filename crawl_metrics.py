@@ -0,0 +1,186 @@
+# crawl_metrics.py
+
+import json
+import os
+import socket
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+RUN_LOG_PATH = os.environ.get("CRAWL_RUN_LOG", "crawl_runs.jsonl")
+PROM_TEXTFILE_PATH = os.environ.get("CRAWL_PROM_TEXTFILE", "crawl_metrics.prom")
+
+# Work that isn't tied to one role (e.g. the shared browser start) is booked here
+NO_ROLE = "all"
+
+# Stages that belong to a single listing/job page and go into its run-log record;
+# role_total and browser_start span many pages and only show up in the summaries
+PAGE_STAGES = frozenset({"listing_load", "listing_wait", "page_load", "page_wait", "archive", "parse", "db_write"})
+
+JOB_FIELDS = ("title", "company", "experience", "salary", "location", "description", "skills", "posted_date")
+
+
+def _prom_labels(**labels):
+    def escape(value):
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class CrawlMetrics:
+    """Per-role stage timings and counters for one scraper run.
+
+    Page-level events go to a JSONL run log as they happen; finish() appends a
+    run summary there, writes a Prometheus textfile and prints a report.
+    """
+
+    def __init__(self, run_log_path=RUN_LOG_PATH, prom_path=PROM_TEXTFILE_PATH):
+        self.run_log_path = run_log_path
+        self.prom_path = prom_path
+        self.run_id = time.strftime("%Y%m%dT%H%M%S")
+        self.worker = f"{socket.gethostname()}-{os.getpid()}"
+        self.started_at = time.time()
+
+        self.stage_seconds = defaultdict(float)   # (role, stage) -> seconds
+        self.stage_calls = defaultdict(int)       # (role, stage) -> calls
+        self.counters = defaultdict(int)          # (role, counter) -> count
+        self.field_na = defaultdict(int)          # (role, field) -> "N/A" extractions
+        self._page_timings = {}
+        self._page_role = None
+
+    @contextmanager
+    def stage(self, role, name):
+        role = role or NO_ROLE
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_seconds[(role, name)] += elapsed
+            self.stage_calls[(role, name)] += 1
+            if name in PAGE_STAGES:
+                if role != self._page_role:
+                    # Never carry a previous role's unfinished page over
+                    self._page_timings = {}
+                    self._page_role = role
+                self._page_timings[name] = self._page_timings.get(name, 0.0) + elapsed
+
+    def incr(self, role, name, n=1):
+        role = role or NO_ROLE
+        self.counters[(role, name)] += n
+
+    def record_job(self, role, job_data):
+        role = role or NO_ROLE
+        for field in JOB_FIELDS:
+            if job_data.get(field) == "N/A":
+                self.field_na[(role, field)] += 1
+
+    def page_done(self, role, kind, url, status, **extra):
+        # One JSONL line per listing/job page with the stage timings it accumulated
+        role = role or NO_ROLE
+        self.incr(role, f"{kind}_pages_{status}")
+        timings = {name: round(seconds, 4) for name, seconds in self._page_timings.items()}
+        self._page_timings = {}
+        self._write_log({
+            "type": "page", "run_id": self.run_id, "worker": self.worker, "ts": time.time(),
+            "role": role, "kind": kind, "url": url, "status": status, "timings": timings, **extra,
+        })
+
+    def _write_log(self, record):
+        try:
+            with open(self.run_log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write crawl run log: {e}")
+
+    def roles(self):
+        return sorted({role for role, _ in list(self.stage_seconds) + list(self.counters)})
+
+    def role_summary(self, role):
+        counters = {name: count for (r, name), count in self.counters.items() if r == role}
+        job_pages = counters.get("job_pages_ok", 0) + counters.get("job_pages_failed", 0)
+        role_seconds = self.stage_seconds.get((role, "role_total"), 0.0)
+        return {
+            "role": role,
+            "job_pages": job_pages,
+            "pages_per_min": round(job_pages / role_seconds * 60, 2) if role_seconds else None,
+            "counters": counters,
+            "na_rates": {
+                field: round(count / counters["job_pages_ok"], 3)
+                for (r, field), count in self.field_na.items() if r == role and counters.get("job_pages_ok")
+            },
+            "stage_seconds": {
+                stage: round(seconds, 2) for (r, stage), seconds in self.stage_seconds.items() if r == role
+            },
+        }
+
+    def write_prometheus(self):
+        lines = [
+            "# HELP naukri_crawl_stage_seconds_total Time spent per crawl stage.",
+            "# TYPE naukri_crawl_stage_seconds_total counter",
+        ]
+        for (role, stage), seconds in sorted(self.stage_seconds.items()):
+            labels = _prom_labels(role=role, stage=stage, worker=self.worker)
+            lines.append(f"naukri_crawl_stage_seconds_total{labels} {seconds:.6f}")
+
+        lines += ["# HELP naukri_crawl_events_total Crawl counters (pages, retries, inserts, duplicates).",
+                  "# TYPE naukri_crawl_events_total counter"]
+        for (role, name), count in sorted(self.counters.items()):
+            lines.append(f"naukri_crawl_events_total{_prom_labels(role=role, event=name, worker=self.worker)} {count}")
+
+        lines += ["# HELP naukri_crawl_field_na_total Job pages where a field was extracted as N/A.",
+                  "# TYPE naukri_crawl_field_na_total counter"]
+        for (role, field), count in sorted(self.field_na.items()):
+            lines.append(f"naukri_crawl_field_na_total{_prom_labels(role=role, field=field, worker=self.worker)} {count}")
+
+        lines += ["# HELP naukri_crawl_pages_per_minute Job pages fetched per minute of role crawl time.",
+                  "# TYPE naukri_crawl_pages_per_minute gauge"]
+        for role in self.roles():
+            rate = self.role_summary(role)["pages_per_min"]
+            if rate is not None:
+                lines.append(f"naukri_crawl_pages_per_minute{_prom_labels(role=role, worker=self.worker)} {rate}")
+
+        lines += ["# HELP naukri_crawl_last_run_timestamp_seconds When the last crawl run finished.",
+                  "# TYPE naukri_crawl_last_run_timestamp_seconds gauge",
+                  f"naukri_crawl_last_run_timestamp_seconds {time.time():.0f}"]
+
+        # Textfile collectors may read at any time: write then rename
+        tmp_path = f"{self.prom_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.prom_path)
+
+    def report(self):
+        lines = [f"📊 Crawl run {self.run_id} ({time.time() - self.started_at:.0f}s, worker {self.worker})"]
+        for role in self.roles():
+            summary = self.role_summary(role)
+            if role == NO_ROLE:
+                lines.append("  shared: " + ", ".join(f"{stage} {seconds:.1f}s"
+                                                      for stage, seconds in summary["stage_seconds"].items()))
+                continue
+            c = summary["counters"]
+            rate = summary["pages_per_min"]
+            lines.append(
+                f"  {role}: {summary['job_pages']} job pages"
+                f" ({rate if rate is not None else 'n/a'}/min) |"
+                f" parse failures {c.get('parse_failures', 0)} | retries {c.get('retries', 0)} |"
+                f" inserted {c.get('inserted', 0)} | duplicates {c.get('duplicates', 0)}"
+            )
+            stages = sorted(summary["stage_seconds"].items(), key=lambda item: item[1], reverse=True)
+            lines.append("    time: " + ", ".join(f"{stage} {seconds:.1f}s" for stage, seconds in stages
+                                                  if stage != "role_total"))
+            if summary["na_rates"]:
+                na = sorted(summary["na_rates"].items(), key=lambda item: item[1], reverse=True)
+                lines.append("    N/A rate: " + ", ".join(f"{field} {rate:.0%}" for field, rate in na))
+        return "\n".join(lines)
+
+    def finish(self):
+        self._write_log({
+            "type": "run", "run_id": self.run_id, "worker": self.worker,
+            "started_at": self.started_at, "finished_at": time.time(),
+            "roles": [self.role_summary(role) for role in self.roles()],
+        })
+        try:
+            self.write_prometheus()
+        except OSError as e:
+            print(f"⚠️ Could not write Prometheus textfile: {e}")
+        print("\n" + self.report())
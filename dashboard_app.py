@@ -1,31 +1,45 @@
+import json
+import time
+import zlib
+from urllib.parse import urlencode
+
 import dash
 import dash_bootstrap_components as dbc
-import pandas as pd
-import plotly.express as px
-from dash import dcc, html, Input, Output
+from dash import ctx, dcc, html, Input, Output, no_update
 from dash.dependencies import State
+from flask import Response, has_request_context, request
 
-# Load data
-df = pd.read_csv("cleaned_jobs.csv")
-df_complete = df[df['avg_salary'].notna() & df['years_exp'].notna()]
+from db_utils import search_job_urls
+from report_jobs import PREVIEW_COLUMNS, PREVIEW_ROWS, ReportQueue, report_key
 
-# Prepare exploded columns for filters
-df_locations = df['clean_location'].dropna().str.split(',').explode().str.strip()
-df_skills = df['clean_skills'].dropna().str.split(',').explode().str.strip()
+import data_store
+from data_store import get_snapshot
 
+# Nothing dataset-related happens at import: get_snapshot() loads the data on
+# first use, and warm_up() (gunicorn master / dev server) does it ahead of time.
+# pandas and plotly.express are imported by the functions that render figures.
 
-roles = df['role'].dropna().unique()
-locations = df_locations.unique()
-skills = df_skills.unique()
+EXPORT_ROUTE = "/export/jobs.csv"
+EXPORT_CHUNK_ROWS = 5000
 
 # Initialize Dash app with dark theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
 app.title = "AI Job Market Analyzer"
 server = app.server
 
-# Layout
-app.layout = dbc.Container([
+# Layout - built per page load so new visitors always see the current dataset
+def serve_layout():
+    # Dash also calls this once when the layout is assigned, outside any request,
+    # just to collect component IDs - that call mustn't load the dataset
+    if has_request_context():
+        snapshot = get_snapshot()
+        version, roles, locations, skills = snapshot.version, snapshot.roles, snapshot.locations, snapshot.skills
+    else:
+        version, roles, locations, skills = None, [], [], []
+    return dbc.Container([
     html.H1("AI Job Market Analyzer", className='text-center my-4'),
+    dcc.Store(id='dataset-version', data=version),
+    dcc.Interval(id='dataset-poll', interval=max(data_store.POLL_SECONDS, 5) * 1000),
 # Toggle show_salary_only
 html.Div([
     dcc.Checklist(
@@ -44,12 +58,26 @@ html.Div([
         'marginBottom': '20px', 'fontSize': '18px', 'textAlign': 'center'
     }),
 
+    # Keyword search over title, description and skills (FTS5 index in jobs.db)
+    dbc.Row([
+        dbc.Col([
+            dcc.Input(
+                id='keyword-filter',
+                type='search',
+                placeholder="Search titles, descriptions and skills (e.g. pytorch llm)",
+                debounce=True,
+                className='form-control',
+                style={'color': 'white', 'backgroundColor': '#121212'},
+            )
+        ], width=12),
+    ], className="mb-3"),
+
     # Filters Row
     dbc.Row([
         dbc.Col([
             dcc.Dropdown(
                 id='role-filter',
-                options=[{'label': r, 'value': r} for r in sorted(roles)],
+                options=[{'label': r, 'value': r} for r in roles],
                 placeholder="Select Role",
                 multi=True,
                 clearable=True,
@@ -60,7 +88,7 @@ html.Div([
         dbc.Col([
             dcc.Dropdown(
                 id='location-filter',
-                options=[{'label': loc, 'value': loc} for loc in sorted(locations)],
+                options=[{'label': loc, 'value': loc} for loc in locations],
                 placeholder="Select Location",
                 multi=True,
                 clearable=True,
@@ -71,7 +99,7 @@ html.Div([
         dbc.Col([
             dcc.Dropdown(
                 id='skills-filter',
-                options=[{'label': skill, 'value': skill} for skill in sorted(skills)],
+                options=[{'label': skill, 'value': skill} for skill in skills],
                 placeholder="Select Skills",
                 multi=True,
                 clearable=True,
@@ -95,11 +123,17 @@ dbc.Row([
 
 
     html.Div([
-        html.Button("Download CSV", id="download-btn", n_clicks=0, className="btn btn-primary m-2"),
-        dcc.Download(id="download-component"),
+        # Plain links to the streaming export route, kept in sync with the filters
+        html.A("Download CSV", id="download-btn", href=EXPORT_ROUTE, className="btn btn-primary m-2"),
+        html.A("Download CSV (.gz)", id="download-gz-btn", href=f"{EXPORT_ROUTE}?gzip=1",
+               className="btn btn-primary m-2"),
 
         html.Button("Download PDF", id="download-pdf-btn", n_clicks=0, className="btn btn-secondary m-2"),
-        dcc.Download(id="pdf-download")
+        dcc.Download(id="pdf-download"),
+        # PDFs render in the background report queue; the page polls until ready
+        dcc.Store(id="pdf-job"),
+        dcc.Interval(id="pdf-poll", interval=1000, disabled=True),
+        html.Div(id="pdf-status", style={"fontSize": "14px"}),
     ], style={"textAlign": "center", "marginBottom": "20px"}),
 
     # Graphs Row 1: Salary and Experience histograms
@@ -174,29 +208,57 @@ dbc.Row([
 ], fluid=True, style={'backgroundColor': '#121212', 'color': 'white', 'minHeight': '100vh'})
 
 
+app.layout = serve_layout
+
 
 @app.callback(
-    Output('salary-histogram', 'figure'),
-    Output('experience-histogram', 'figure'),
-    Output('location-bar', 'figure'),
-    Output('skills-bar', 'figure'),
-    Output('companies-bar', 'figure'),  # NEW
-    Output('heatmap-role-exp', 'figure'),
-    Output('trend-line', 'figure'),
-    Output('insights-box', 'children'),
-    Output('exp-vs-salary-scatter', 'figure'),
-    Input('role-filter', 'value'),
-    Input('location-filter', 'value'),
-    Input('skills-filter', 'value'),
-    Input('salary-toggle', 'value'),
+    Output('dataset-version', 'data'),
+    Output('role-filter', 'options'),
+    Output('location-filter', 'options'),
+    Output('skills-filter', 'options'),
+    Input('dataset-poll', 'n_intervals'),
+    State('dataset-version', 'data'),
+    prevent_initial_call=True
 )
-def update_graphs(selected_roles, selected_locations, selected_skills, salary_toggle):
-    if 'with_salary' in salary_toggle:
+def sync_dataset_version(n_intervals, current_version):
+    snapshot = get_snapshot()
+    if snapshot.version == current_version:
+        return no_update, no_update, no_update, no_update
+
+    # A reload happened since this page was rendered: refresh dropdowns, and the
+    # version change re-runs the graphs against the new snapshot
+    return (
+        snapshot.version,
+        [{'label': r, 'value': r} for r in snapshot.roles],
+        [{'label': loc, 'value': loc} for loc in snapshot.locations],
+        [{'label': skill, 'value': skill} for skill in snapshot.skills],
+    )
+
+
+
+def base_frame(snapshot, salary_toggle):
+    if salary_toggle and 'with_salary' in salary_toggle:
         # Strict mode → only rows with salary + exp
-        filtered_df = df[df['avg_salary'].notna() & df['years_exp'].notna()].copy()
-    else:
-        # Allow missing salary → only require experience
-        filtered_df = df[df['years_exp'].notna()].copy()
+        return snapshot.df_complete
+    # Allow missing salary → only require experience
+    return snapshot.df_with_exp
+
+
+def filter_jobs(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword=None):
+    # Callers may modify the result, so it must never share data with the snapshot
+    return apply_filters(snapshot, base_frame(snapshot, salary_toggle).copy(),
+                         selected_roles, selected_locations, selected_skills, keyword)
+
+
+def apply_filters(snapshot, filtered_df, selected_roles, selected_locations, selected_skills, keyword=None):
+    # Never modifies filtered_df in place: it may be a slice of the snapshot
+    # Filter by keyword - matching URLs come from the FTS5 index, not a string scan
+    if keyword and keyword.strip():
+        keyword = keyword.strip()
+        matching_urls = snapshot.cached_lru(('keyword', keyword), lambda: search_job_urls(keyword))
+        # None: nothing searchable in the input (e.g. only quotes), so no keyword filter
+        if matching_urls is not None:
+            filtered_df = filtered_df[filtered_df['url'].isin(matching_urls)]
 
     # Filter by roles
     if selected_roles:
@@ -204,26 +266,124 @@ def update_graphs(selected_roles, selected_locations, selected_skills, salary_to
 
     # Filter by locations - explode and strip, drop empty strings
     if selected_locations:
-        filtered_df['clean_location'] = filtered_df['clean_location'].fillna('').astype(str)
-        exploded_loc = filtered_df.assign(clean_location=filtered_df['clean_location'].str.split(',')).explode(
-            'clean_location')
+        locations = filtered_df['clean_location'].fillna('').astype(str)
+        exploded_loc = filtered_df.assign(clean_location=locations.str.split(',')).explode('clean_location')
         exploded_loc['clean_location'] = exploded_loc['clean_location'].str.strip()
         exploded_loc = exploded_loc[exploded_loc['clean_location'] != '']
         filtered_df = exploded_loc[exploded_loc['clean_location'].isin(selected_locations)].reset_index(drop=True)
 
     # Filter by skills - explode and strip, drop empty strings
     if selected_skills:
-        filtered_df['clean_skills'] = filtered_df['clean_skills'].fillna('').astype(str)
-        exploded_skills = filtered_df.assign(clean_skills=filtered_df['clean_skills'].str.split(',')).explode(
-            'clean_skills')
+        skills = filtered_df['clean_skills'].fillna('').astype(str)
+        exploded_skills = filtered_df.assign(clean_skills=skills.str.split(',')).explode('clean_skills')
         exploded_skills['clean_skills'] = exploded_skills['clean_skills'].str.strip()
         exploded_skills = exploded_skills[exploded_skills['clean_skills'] != '']  # drop empty strings
         filtered_df = exploded_skills[exploded_skills['clean_skills'].isin(selected_skills)].reset_index(drop=True)
 
+    return filtered_df
+
+
+def rollup_view(snapshot, selected_roles, selected_locations, selected_skills, keyword=None):
+    # Rollups are keyed by (role, week) only, so they can't answer location/skill/keyword filters
+    if selected_locations or selected_skills or (keyword and keyword.strip()):
+        return None
+    rollups = snapshot.weekly_rollups
+    if rollups.empty:
+        return None
+    if selected_roles:
+        rollups = rollups[rollups['role'].isin(selected_roles)]
+    return rollups
+
+
+def salary_percentiles(snapshot, filtered_df, selected_roles, selected_locations, selected_skills,
+                       salary_toggle=None, keyword=None):
+    # Role x location views merge the prebuilt sketches: cost scales with the number of
+    # segments, not postings. Skill and keyword filters need the exact rows instead, and
+    # so do sketch files from before the salary-only experience metric existed.
+    sketches = snapshot.sketches
+    if (sketches is not None and 'years_exp_with_salary' in sketches.metrics
+            and not selected_skills and not (keyword and keyword.strip())):
+        # With the salary toggle on, experience only counts postings that list a salary
+        exp_metric = 'years_exp_with_salary' if salary_toggle and 'with_salary' in salary_toggle else 'years_exp'
+        salary = sketches.merged('avg_salary', selected_roles, selected_locations)
+        experience = sketches.merged(exp_metric, selected_roles, selected_locations)
+        return salary.quantiles([0.25, 0.5, 0.9]), experience.quantiles([0.5])[0]
+    salary_q = filtered_df['avg_salary'].quantile([0.25, 0.5, 0.9]).tolist()
+    return salary_q, filtered_df['years_exp'].median()
+
+
+def format_lpa(value):
+    import pandas as pd
+
+    return "N/A" if value is None or pd.isna(value) else f"₹{value / 100000:.1f} LPA"
+
+
+@app.callback(
+    Output('salary-histogram', 'figure'),
+    Output('experience-histogram', 'figure'),
+    Output('location-bar', 'figure'),
+    Output('skills-bar', 'figure'),
+    Output('companies-bar', 'figure'),  # NEW
+    Output('heatmap-role-exp', 'figure'),
+    Output('trend-line', 'figure'),
+    Output('insights-box', 'children'),
+    Output('exp-vs-salary-scatter', 'figure'),
+    Input('role-filter', 'value'),
+    Input('location-filter', 'value'),
+    Input('skills-filter', 'value'),
+    Input('salary-toggle', 'value'),
+    Input('keyword-filter', 'value'),
+    Input('dataset-version', 'data'),
+)
+def update_graphs(selected_roles, selected_locations, selected_skills, salary_toggle, keyword, dataset_version=None):
+    snapshot = get_snapshot()
+    key = prerender_key(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword)
+    if key is None:
+        return render_graphs(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword)
+
+    # Default views: served from JSON rendered by warm_up() (or by the first request)
+    payload = snapshot.cached(key, lambda: prerender(snapshot, list(key[1])))
+    return tuple(json.loads(payload))
+
+
+def prerender_key(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword):
+    # Only the unfiltered view and single-role selections from the dataset's own
+    # roles are kept, so clients can't add entries; anything else is rendered per request
+    if selected_locations or selected_skills or salary_toggle or (keyword and keyword.strip()):
+        return None
+    roles = tuple(selected_roles or ())
+    if len(roles) > 1 or (roles and roles[0] not in snapshot.roles):
+        return None
+    return ('prerendered', roles)
+
+
+def prerender(snapshot, selected_roles):
+    from plotly.utils import PlotlyJSONEncoder
+
+    outputs = render_graphs(snapshot, selected_roles, [], [], [], None)
+    return json.dumps(outputs, cls=PlotlyJSONEncoder)
+
+
+def warm_up(snapshot=None):
+    """Render the default views of a snapshot ahead of the first visitor."""
+    # No watcher here: this may run in the gunicorn master, which serves no requests
+    snapshot = snapshot or get_snapshot(watch=False)
+    start = time.perf_counter()
+    for roles in [[]] + [[role] for role in snapshot.roles]:
+        key = prerender_key(snapshot, roles, [], [], [], None)
+        snapshot.cached(key, lambda: prerender(snapshot, roles))
+    print(f"🔥 Pre-rendered {len(snapshot.roles) + 1} default views in {time.perf_counter() - start:.1f}s")
+
+
+def render_graphs(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword):
+    import pandas as pd
+    import plotly.express as px
+
+    filtered_df = filter_jobs(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword)
 
     # Check if filtered dataframe is empty
     if filtered_df.empty:
-        no_data_fig = px.histogram(title="No data available for selected filters")
+        no_data_fig = px.histogram(x=[], title="No data available for selected filters")
         no_data_fig.update_layout(
             plot_bgcolor='#121212', paper_bgcolor='#121212', font=dict(color='white')
         )
@@ -231,7 +391,7 @@ def update_graphs(selected_roles, selected_locations, selected_skills, salary_to
         # Return empty graphs and insight text
         return (
             no_data_fig, no_data_fig, no_data_fig, no_data_fig,
-            no_data_fig, no_data_fig, insight_text, no_data_fig
+            no_data_fig, no_data_fig, no_data_fig, insight_text, no_data_fig
         )
 
     # Color sequences for multi-color attractive plots
@@ -384,14 +544,19 @@ def update_graphs(selected_roles, selected_locations, selected_skills, salary_to
         showlegend=True
     )
     # Trend Over Time Line Chart
-    # Clean date column
-    filtered_df['posted_date_cleaned'] = pd.to_datetime(filtered_df['posted_date_cleaned'], errors='coerce')
-
-    trend_df = filtered_df.dropna(subset=['posted_date_cleaned']).copy()
-    trend_df['week'] = trend_df['posted_date_cleaned'].dt.to_period('W').dt.start_time
-
-    # Group by week and role
-    trend_grouped = trend_df.groupby(['week', 'role']).size().reset_index(name='Job Count')
+    # Role-only views read the precomputed weekly rollups (months of history);
+    # other filters need the row-level week key of the current crawl
+    rollups = rollup_view(snapshot, selected_roles, selected_locations, selected_skills, keyword)
+    if rollups is not None:
+        count_column = 'with_salary_count' if salary_toggle and 'with_salary' in salary_toggle else 'job_count'
+        trend_grouped = rollups[['week', 'role', count_column]].rename(columns={count_column: 'Job Count'})
+    else:
+        trend_grouped = (
+            filtered_df.dropna(subset=['posted_week'])
+            .groupby(['posted_week', 'role']).size()
+            .reset_index(name='Job Count')
+            .rename(columns={'posted_week': 'week'})
+        )
 
     trend_fig = px.line(
         trend_grouped,
@@ -419,110 +584,172 @@ def update_graphs(selected_roles, selected_locations, selected_skills, salary_to
 
 
     # Generate simple insights text
-    avg_salary = filtered_df['avg_salary'].mean()
+    if rollups is not None and rollups['salary_count'].sum():
+        avg_salary = rollups['salary_sum'].sum() / rollups['salary_count'].sum()
+    else:
+        avg_salary = filtered_df['avg_salary'].mean()
     avg_exp = filtered_df['years_exp'].mean()
     total_jobs = len(filtered_df)
+    # Reposts and the same posting under several roles share a cluster ID
+    if 'dup_cluster_id' in filtered_df.columns:
+        unique_jobs = filtered_df['dup_cluster_id'].nunique()
+    else:
+        unique_jobs = filtered_df['id'].nunique()
     top_role = filtered_df['role'].mode().iloc[0] if not filtered_df['role'].mode().empty else "N/A"
 
+    (p25_salary, median_salary, p90_salary), median_exp = salary_percentiles(
+        snapshot, filtered_df, selected_roles, selected_locations, selected_skills, salary_toggle, keyword
+    )
+
     insight_text = (
         f"Filtered Jobs: {total_jobs} | "
+        f"Unique Postings: {unique_jobs} | "
         f"Average Salary: ₹{avg_salary / 100000:.1f} LPA | "
+        f"Median Salary: {format_lpa(median_salary)} "
+        f"(P25 {format_lpa(p25_salary)}, P90 {format_lpa(p90_salary)}) | "
 
         f"Average Experience Required: {avg_exp:.1f} years | "
+        f"Median Experience: {'N/A' if median_exp is None or pd.isna(median_exp) else f'{median_exp:.1f} years'} | "
         f"Most Common Role: {top_role}"
     )
 
     return salary_fig, exp_fig, loc_fig, skills_fig, companies_fig, heatmap_fig,trend_fig, insight_text, scatter_fig
 
 
-import io
-from xhtml2pdf import pisa
-import base64
+report_queue = ReportQueue()
+
+
+def queue_pdf_report(snapshot, key, selected_roles, selected_locations, selected_skills, salary_toggle, keyword):
+    filtered_df = filter_jobs(snapshot, selected_roles, selected_locations, selected_skills, salary_toggle, keyword)
+    preview = filtered_df.iloc[:PREVIEW_ROWS, :PREVIEW_COLUMNS]
+    report_queue.submit(key, list(preview.columns), preview.values.tolist(), len(filtered_df))
+
 
 @app.callback(
     Output("pdf-download", "data"),
+    Output("pdf-job", "data"),
+    Output("pdf-poll", "disabled"),
+    Output("pdf-status", "children"),
     Input("download-pdf-btn", "n_clicks"),
+    Input("pdf-poll", "n_intervals"),
+    State("pdf-job", "data"),
     State('role-filter', 'value'),
     State('location-filter', 'value'),
     State('skills-filter', 'value'),
     State('salary-toggle', 'value'),
+    State('keyword-filter', 'value'),
     prevent_initial_call=True
 )
-def download_pdf(n_clicks, selected_roles, selected_locations, selected_skills, salary_toggle):
-    if 'with_salary' in salary_toggle:
-        filtered_df = df[df['avg_salary'].notna() & df['years_exp'].notna()].copy()
-    else:
-        filtered_df = df[df['years_exp'].notna()].copy()
-
-    if selected_roles:
-        filtered_df = filtered_df[filtered_df['role'].isin(selected_roles)]
-
-    if selected_locations:
-        filtered_df['clean_location'] = filtered_df['clean_location'].fillna('').astype(str)
-        exploded_loc = filtered_df.assign(clean_location=filtered_df['clean_location'].str.split(',')).explode('clean_location')
-        exploded_loc['clean_location'] = exploded_loc['clean_location'].str.strip()
-        filtered_df = exploded_loc[exploded_loc['clean_location'].isin(selected_locations)].reset_index(drop=True)
-
-    if selected_skills:
-        filtered_df['clean_skills'] = filtered_df['clean_skills'].fillna('').astype(str)
-        exploded_skills = filtered_df.assign(clean_skills=filtered_df['clean_skills'].str.split(',')).explode('clean_skills')
-        exploded_skills['clean_skills'] = exploded_skills['clean_skills'].str.strip()
-        filtered_df = exploded_skills[exploded_skills['clean_skills'].isin(selected_skills)].reset_index(drop=True)
-
-    # Build a simple HTML report
-    html_content = f"""
-    <h2>AI Job Market Filtered Report</h2>
-    <p>Total Records: {len(filtered_df)}</p>
-    <table border="1" cellpadding="5" cellspacing="0">
-        <tr>{"".join(f"<th>{col}</th>" for col in filtered_df.columns[:6])}</tr>
-        {''.join(f"<tr>{''.join(f'<td>{val}</td>' for val in row[:6])}</tr>" for row in filtered_df.values[:20])}
-    </table>
-    """
-
-    # Convert HTML to PDF
-    pdf_stream = io.BytesIO()
-    pisa.CreatePDF(io.StringIO(html_content), dest=pdf_stream)
-    pdf_stream.seek(0)
-    pdf_base64 = base64.b64encode(pdf_stream.read()).decode("utf-8")
-
-    return {
-        "content": pdf_base64,
-        "filename": "ai_job_market_filtered_report.pdf",
-        "base64": True
+def download_pdf(n_clicks, n_intervals, job, selected_roles, selected_locations, selected_skills,
+                 salary_toggle, keyword):
+    if ctx.triggered_id == "download-pdf-btn":
+        snapshot = get_snapshot()
+        # The job remembers what it was queued for: filters may change before the polls end
+        filters = [selected_roles, selected_locations, selected_skills, salary_toggle, keyword]
+        job = {'key': report_key(snapshot.version, *filters), 'version': snapshot.version, 'filters': filters}
+        # Repeat requests for the same filter set are served straight from the cache
+        if report_queue.cached(job['key']) is None:
+            queue_pdf_report(snapshot, job['key'], *filters)
+    elif not job:
+        return no_update, no_update, True, ""
+
+    try:
+        pdf = report_queue.result(job['key'])
+    except Exception as e:
+        print(f"❌ Error generating PDF report: {e}")
+        return no_update, None, True, "❌ Could not generate the PDF report."
+
+    if pdf is None:
+        # The poll may land on a different gunicorn worker than the click did
+        if not report_queue.is_pending(job['key']):
+            snapshot = get_snapshot()
+            if snapshot.version != job['version']:
+                # Reloaded meanwhile: render the same filters against the new data, under its own key
+                job = {**job, 'key': report_key(snapshot.version, *job['filters']), 'version': snapshot.version}
+            if report_queue.cached(job['key']) is None:
+                queue_pdf_report(snapshot, job['key'], *job['filters'])
+        return no_update, job, False, "⏳ Generating PDF report..."
+
+    return dcc.send_bytes(pdf, "ai_job_market_filtered_report.pdf"), None, True, ""
+
+
+def export_query(selected_roles, selected_locations, selected_skills, salary_toggle, keyword):
+    params = {
+        'role': selected_roles or [],
+        'location': selected_locations or [],
+        'skill': selected_skills or [],
     }
+    if salary_toggle and 'with_salary' in salary_toggle:
+        params['with_salary'] = 1
+    if keyword and keyword.strip():
+        params['q'] = keyword.strip()
+    return urlencode(params, doseq=True)
 
 
 @app.callback(
-    Output("download-component", "data"),
-    Input("download-btn", "n_clicks"),
-    State('role-filter', 'value'),
-    State('location-filter', 'value'),
-    State('skills-filter', 'value'),
-    State('salary-toggle', 'value'),
-    prevent_initial_call=True
+    Output("download-btn", "href"),
+    Output("download-gz-btn", "href"),
+    Input('role-filter', 'value'),
+    Input('location-filter', 'value'),
+    Input('skills-filter', 'value'),
+    Input('salary-toggle', 'value'),
+    Input('keyword-filter', 'value'),
 )
-def download_filtered_data(n_clicks, selected_roles, selected_locations, selected_skills, salary_toggle):
-    if 'with_salary' in salary_toggle:
-        filtered_df = df[df['avg_salary'].notna() & df['years_exp'].notna()].copy()
-    else:
-        filtered_df = df[df['years_exp'].notna()].copy()
-
-    if selected_roles:
-        filtered_df = filtered_df[filtered_df['role'].isin(selected_roles)]
-
-    if selected_locations:
-        filtered_df['clean_location'] = filtered_df['clean_location'].fillna('').astype(str)
-        exploded_loc = filtered_df.assign(clean_location=filtered_df['clean_location'].str.split(',')).explode('clean_location')
-        exploded_loc['clean_location'] = exploded_loc['clean_location'].str.strip()
-        filtered_df = exploded_loc[exploded_loc['clean_location'].isin(selected_locations)].reset_index(drop=True)
-
-    if selected_skills:
-        filtered_df['clean_skills'] = filtered_df['clean_skills'].fillna('').astype(str)
-        exploded_skills = filtered_df.assign(clean_skills=filtered_df['clean_skills'].str.split(',')).explode('clean_skills')
-        exploded_skills['clean_skills'] = exploded_skills['clean_skills'].str.strip()
-        filtered_df = exploded_skills[exploded_skills['clean_skills'].isin(selected_skills)].reset_index(drop=True)
+def update_export_links(selected_roles, selected_locations, selected_skills, salary_toggle, keyword):
+    query = export_query(selected_roles, selected_locations, selected_skills, salary_toggle, keyword)
+    csv_href = f"{EXPORT_ROUTE}?{query}" if query else EXPORT_ROUTE
+    gz_href = f"{EXPORT_ROUTE}?{query}&gzip=1" if query else f"{EXPORT_ROUTE}?gzip=1"
+    return csv_href, gz_href
+
+
+def iter_csv_chunks(frame, filter_chunk=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # Header first, then the frame in fixed-size row slices, each filtered on its own:
+    # nothing is copied up front and memory stays bounded by one chunk
+    yield frame.iloc[:0].to_csv(index=False)
+    for start in range(0, len(frame), chunk_rows):
+        chunk = frame.iloc[start:start + chunk_rows]
+        if filter_chunk is not None:
+            chunk = filter_chunk(chunk)
+        if not chunk.empty:
+            yield chunk.to_csv(index=False, header=False)
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@server.route(EXPORT_ROUTE)
+def export_filtered_data():
+    args = request.args
+    snapshot = get_snapshot()
+    roles, locations, skills = args.getlist('role'), args.getlist('location'), args.getlist('skill')
+    keyword = args.get('q')
+
+    filename = "ai_job_market_filtered_report.csv"
+    chunks = iter_csv_chunks(
+        base_frame(snapshot, ['with_salary'] if args.get('with_salary') else []),
+        lambda chunk: apply_filters(snapshot, chunk, roles, locations, skills, keyword),
+    )
+    if args.get('gzip'):
+        return Response(
+            gzip_chunks(chunks),
+            mimetype="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'},
+        )
+    return Response(
+        (chunk.encode("utf-8") for chunk in chunks),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-    return dcc.send_data_frame(filtered_df.to_csv, "ai_job_market_filtered_report.csv", index=False)
+# Reloaded snapshots get their default views rendered before they are swapped in
+data_store.on_snapshot_loaded(warm_up)
 
 if __name__ == "__main__":
+    warm_up()
     app.run(debug=True)
\ No newline at end of file
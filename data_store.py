@@ -0,0 +1,184 @@
+# data_store.py
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from db_utils import load_weekly_rollups
+from quantile_sketch import SKETCH_PATH, SegmentSketches
+
+DATA_PATH = os.environ.get("CLEANED_JOBS_PATH", "cleaned_jobs.csv")
+POLL_SECONDS = float(os.environ.get("DATASET_POLL_SECONDS", "60"))
+QUERY_CACHE_SIZE = int(os.environ.get("QUERY_CACHE_SIZE", "256"))
+
+ROLLUP_COLUMNS = ['role', 'week', 'job_count', 'salary_sum', 'salary_count', 'with_salary_count']
+
+
+class DatasetSnapshot:
+    """Immutable view of one cleaned-data version plus everything derived from it.
+
+    Callbacks grab a snapshot once and use it to the end, so a reload swapping
+    in a newer one never changes the data under a request that is in flight.
+    """
+
+    def __init__(self, df, version, weekly_rollups=None, sketches=None):
+        self.version = version
+        self.df = df
+        self.df_complete = df[df['avg_salary'].notna() & df['years_exp'].notna()]
+        self.df_with_exp = df[df['years_exp'].notna()]
+
+        # Exploded columns for the filter dropdowns
+        df_locations = df['clean_location'].dropna().str.split(',').explode().str.strip()
+        df_skills = df['clean_skills'].dropna().str.split(',').explode().str.strip()
+
+        self.roles = sorted(df['role'].dropna().unique())
+        self.locations = sorted(loc for loc in df_locations.unique() if loc)
+        self.skills = sorted(skill for skill in df_skills.unique() if skill)
+
+        # Historical postings per (role, week) from the append-only rollup table
+        if weekly_rollups is None:
+            import pandas as pd
+            weekly_rollups = pd.DataFrame(columns=ROLLUP_COLUMNS)
+        self.weekly_rollups = weekly_rollups
+
+        # Salary/experience quantile sketches per (role, location); None if never built
+        self.sketches = sketches
+
+        # Results derived from this version only; dropped together with the snapshot.
+        # cached() is for a fixed set of keys, cached_lru() for keys that come from
+        # user input (e.g. search keywords) and must not grow without bound.
+        self._cache = {}
+        self._lru = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def cached(self, key, compute):
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+        value = compute()
+        with self._cache_lock:
+            return self._cache.setdefault(key, value)
+
+    def cached_lru(self, key, compute, maxsize=QUERY_CACHE_SIZE):
+        with self._cache_lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                return self._lru[key]
+        value = compute()
+        with self._cache_lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > maxsize:
+                self._lru.popitem(last=False)
+        return value
+
+
+def dataset_version(path=DATA_PATH):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def load_snapshot(path=DATA_PATH):
+    # pandas is only imported once a dataset is actually loaded
+    import pandas as pd
+
+    version = dataset_version(path)
+    df = pd.read_csv(path)
+
+    # Dates are parsed once per version here, never inside callbacks; CSVs written
+    # before cleaning produced a week key get one derived on load
+    df['posted_date_cleaned'] = pd.to_datetime(df['posted_date_cleaned'], errors='coerce')
+    if 'posted_week' in df.columns:
+        df['posted_week'] = pd.to_datetime(df['posted_week'], errors='coerce')
+    else:
+        df['posted_week'] = df['posted_date_cleaned'].dt.to_period('W').dt.start_time
+
+    weekly_rollups = pd.DataFrame(
+        load_weekly_rollups(), columns=ROLLUP_COLUMNS
+    )
+    weekly_rollups['week'] = pd.to_datetime(weekly_rollups['week'])
+
+    sketches = SegmentSketches.load(SKETCH_PATH) if os.path.exists(SKETCH_PATH) else None
+    return DatasetSnapshot(df, version, weekly_rollups, sketches)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+_watcher_pid = None
+_load_hooks = []
+
+
+def on_snapshot_loaded(hook):
+    # hook(snapshot) runs on each reloaded snapshot before it is swapped in
+    _load_hooks.append(hook)
+
+
+def get_snapshot(watch=True):
+    global _snapshot
+    if watch:
+        _ensure_watcher()
+
+    snapshot = _snapshot
+    if snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = load_snapshot()
+            snapshot = _snapshot
+    return snapshot
+
+
+def refresh_snapshot(path=DATA_PATH):
+    """Load a newer cleaned-data version, if there is one, and swap it in.
+
+    Returns True when a new snapshot was installed.
+    """
+    global _snapshot
+    try:
+        version = dataset_version(path)
+    except OSError:
+        return False
+
+    current = _snapshot
+    if current is not None and current.version == version:
+        return False
+
+    # Build outside the lock: readers keep using the old snapshot meanwhile
+    snapshot = load_snapshot(path)
+    for hook in _load_hooks:
+        try:
+            hook(snapshot)
+        except Exception as e:
+            print(f"⚠️ Snapshot load hook failed: {e}")
+    with _snapshot_lock:
+        if _snapshot is not None and _snapshot.version == snapshot.version:
+            return False
+        _snapshot = snapshot
+    print(f"🔄 Loaded dataset version {snapshot.version} ({len(snapshot.df)} rows)")
+    return True
+
+
+def _watch(interval):
+    # Check straight away: a worker forked from a preloading master (possibly long
+    # after boot) inherits the master's snapshot, which may already be stale
+    while True:
+        try:
+            # Nothing loaded yet: get_snapshot() is about to load the current version itself
+            if _snapshot is not None:
+                refresh_snapshot()
+        except Exception as e:
+            # A half-written or malformed file: keep serving the current snapshot
+            print(f"❌ Error reloading dataset: {e}")
+        time.sleep(interval)
+
+
+def _ensure_watcher():
+    global _watcher_pid
+    # Threads don't survive fork, so every (gunicorn) worker process starts its own
+    if POLL_SECONDS <= 0 or _watcher_pid == os.getpid():
+        return
+    with _snapshot_lock:
+        if _watcher_pid == os.getpid():
+            return
+        _watcher_pid = os.getpid()
+    threading.Thread(target=_watch, args=(POLL_SECONDS,), name="dataset-watcher", daemon=True).start()
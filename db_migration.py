@@ -1,5 +1,7 @@
 import sqlite3
 
+from db_utils import create_search_index
+
 conn = sqlite3.connect('jobs.db')
 c = conn.cursor()
 
@@ -32,6 +34,15 @@ except sqlite3.OperationalError as e:
     else:
         print(f"❌ Error adding posted_date column: {e}")
 
+# Full-text search index over title, description and skills
+try:
+    if create_search_index(c):
+        print("✅ Built jobs_fts search index.")
+    else:
+        print("⚠️ 'jobs_fts' search index already exists.")
+except sqlite3.OperationalError as e:
+    print(f"❌ Error creating search index: {e}")
+
 # Commit and close
 conn.commit()
 conn.close()
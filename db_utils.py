@@ -1,12 +1,86 @@
 # db_utils.py
 
+import os
+import re
 import sqlite3
+import time
+
+# Search index over one cleaned-data version, written by clean_jobs_data.py
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", "search_index.db")
+
+FRONTIER_MAX_ATTEMPTS = 4
+FRONTIER_BACKOFF_SECONDS = 30
+
+def create_search_index(c):
+    # FTS5 index over the free-text columns, kept in sync with 'jobs' by triggers
+    exists = c.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'jobs_fts';"
+    ).fetchone()
+
+    c.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title,
+            description,
+            skills,
+            content='jobs',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        );
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, description, skills)
+            VALUES (new.id, new.title, new.description, new.skills);
+        END;
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, description, skills)
+            VALUES ('delete', old.id, old.title, old.description, old.skills);
+        END;
+    """)
+    c.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, description, skills)
+            VALUES ('delete', old.id, old.title, old.description, old.skills);
+            INSERT INTO jobs_fts (rowid, title, description, skills)
+            VALUES (new.id, new.title, new.description, new.skills);
+        END;
+    """)
+
+    if not exists:
+        # Index rows that were inserted before the index existed
+        c.execute("INSERT INTO jobs_fts (jobs_fts) VALUES ('rebuild');")
+    return not exists
+
+def create_rollups_table(c):
+    # Append-only: each cleaning run adds one dated snapshot of per (role, week) counts,
+    # so history survives the 'jobs' table being dropped for a fresh crawl
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS weekly_rollups (
+            snapshot_date TEXT NOT NULL,
+            role TEXT NOT NULL,
+            week TEXT NOT NULL,
+            job_count INTEGER NOT NULL,
+            salary_sum REAL NOT NULL,
+            salary_count INTEGER NOT NULL,
+            with_salary_count INTEGER,
+            PRIMARY KEY (snapshot_date, role, week)
+        );
+    """)
+    # Counts follow the dashboard's population: job_count only has postings with an
+    # experience value, salary_* and with_salary_count need experience and salary.
+    # Snapshots saved before that have with_salary_count NULL and counted every posting.
+    columns = [row[1] for row in c.execute("PRAGMA table_info(weekly_rollups);")]
+    if "with_salary_count" not in columns:
+        c.execute("ALTER TABLE weekly_rollups ADD COLUMN with_salary_count INTEGER;")
 
 def create_database(drop_existing=False):
     conn = sqlite3.connect("jobs.db")
     c = conn.cursor()
 
     if drop_existing:
+        c.execute("DROP TABLE IF EXISTS jobs_fts;")
         c.execute("DROP TABLE IF EXISTS jobs;")
         print("🗑️ Dropped existing 'jobs' table.")
 
@@ -27,6 +101,41 @@ def create_database(drop_existing=False):
     """)
     print("✅ 'jobs' table created.")
 
+    create_search_index(c)
+
+    # Index of archived raw pages; kept across crawls so old pages can be re-extracted
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS raw_pages (
+            url TEXT PRIMARY KEY,
+            role TEXT,
+            path TEXT,
+            fetched_at TEXT DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    create_rollups_table(c)
+
+    # Crawl frontier: every listing page and job URL with its crawl state, so an
+    # interrupted crawl resumes where it stopped; kept across crawls like raw_pages
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS crawl_frontier (
+            kind TEXT NOT NULL,
+            role TEXT NOT NULL,
+            url TEXT NOT NULL,
+            page INTEGER,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL DEFAULT 0,
+            last_error TEXT,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (role, url)
+        );
+    """)
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_crawl_frontier_claim
+        ON crawl_frontier (kind, role, state, next_attempt_at);
+    """)
+
     conn.commit()
     conn.close()
 
@@ -52,7 +161,335 @@ VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
             job_data["posted_date"]
         ))
         conn.commit()
+        # False when the URL was already stored (ignored as a duplicate)
+        return c.rowcount == 1
     except Exception as e:
         print(f"❌ Error inserting job: {e}")
+        return False
+    finally:
+        conn.close()
+
+def _enqueue_frontier(c, entries):
+    # Already-known URLs keep their state, so a resumed crawl never redoes finished work
+    c.executemany("INSERT OR IGNORE INTO crawl_frontier (kind, role, url, page) VALUES (?, ?, ?, ?);", entries)
+
+def enqueue_frontier(kind, role, url, page=None):
+    conn = sqlite3.connect("jobs.db")
+    try:
+        _enqueue_frontier(conn.cursor(), [(kind, role, url, page)])
+        conn.commit()
+    finally:
+        conn.close()
+
+def claim_frontier(kind, role):
+    conn = sqlite3.connect("jobs.db", isolation_level=None)
+    c = conn.cursor()
+
+    try:
+        c.execute("BEGIN IMMEDIATE;")
+        row = c.execute("""
+            SELECT url, page, attempts FROM crawl_frontier
+            WHERE kind = ? AND role = ? AND state IN ('pending', 'failed')
+              AND attempts < ? AND next_attempt_at <= ?
+            ORDER BY page, rowid
+            LIMIT 1;
+        """, (kind, role, FRONTIER_MAX_ATTEMPTS, time.time())).fetchone()
+        if row:
+            c.execute("""
+                UPDATE crawl_frontier
+                SET state = 'in_flight', attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE role = ? AND url = ?;
+            """, (role, row[0]))
+        c.execute("COMMIT;")
+        # (url, page, attempt number of this claim)
+        return (row[0], row[1], row[2] + 1) if row else None
+    except Exception:
+        c.execute("ROLLBACK;")
+        raise
+    finally:
+        conn.close()
+
+def complete_frontier(role, url, discovered=()):
+    # Marking a page done and queueing what it yielded ((kind, url, page) tuples) is one transaction
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        _enqueue_frontier(c, [(kind, role, new_url, page) for kind, new_url, page in discovered])
+        c.execute("""
+            UPDATE crawl_frontier SET state = 'done', last_error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE role = ? AND url = ?;
+        """, (role, url))
+        conn.commit()
+    finally:
+        conn.close()
+
+def fail_frontier(role, url, error):
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        # Exponential backoff: 30s, 60s, 120s, ... until FRONTIER_MAX_ATTEMPTS is reached
+        attempts = c.execute("SELECT attempts FROM crawl_frontier WHERE role = ? AND url = ?;",
+                             (role, url)).fetchone()
+        delay = FRONTIER_BACKOFF_SECONDS * 2 ** max((attempts[0] if attempts else 1) - 1, 0)
+        c.execute("""
+            UPDATE crawl_frontier
+            SET state = 'failed', last_error = ?, next_attempt_at = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE role = ? AND url = ?;
+        """, (str(error)[:500], time.time() + delay, role, url))
+        conn.commit()
+    finally:
+        conn.close()
+
+def release_frontier(role, url):
+    # Hand a claimed URL back without charging the attempt: the browser died, not the page
+    conn = sqlite3.connect("jobs.db")
+    try:
+        conn.execute("""
+            UPDATE crawl_frontier
+            SET state = 'pending', attempts = MAX(attempts - 1, 0), updated_at = CURRENT_TIMESTAMP
+            WHERE role = ? AND url = ? AND state = 'in_flight';
+        """, (role, url))
+        conn.commit()
+    finally:
+        conn.close()
+
+def next_frontier_retry(kind, role):
+    # Earliest time a backed-off URL becomes claimable again; None when nothing is left
+    conn = sqlite3.connect("jobs.db")
+    try:
+        row = conn.execute("""
+            SELECT MIN(next_attempt_at) FROM crawl_frontier
+            WHERE kind = ? AND role = ? AND state IN ('pending', 'failed') AND attempts < ?;
+        """, (kind, role, FRONTIER_MAX_ATTEMPTS)).fetchone()
+        return row[0]
+    finally:
+        conn.close()
+
+def reset_frontier(clear=False, retry_failed=False):
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        if clear:
+            c.execute("DELETE FROM crawl_frontier;")
+            print("🗑️ Cleared crawl frontier.")
+        else:
+            # Anything still in flight was interrupted by a crash: hand it back to the queue
+            # without charging the URL for an attempt it never got to finish
+            c.execute("""
+                UPDATE crawl_frontier SET state = 'pending', attempts = MAX(attempts - 1, 0)
+                WHERE state = 'in_flight';
+            """)
+            if c.rowcount:
+                print(f"♻️ Requeued {c.rowcount} interrupted URLs.")
+        if retry_failed and not clear:
+            # URLs that used up FRONTIER_MAX_ATTEMPTS in an earlier run get a fresh set
+            c.execute("""
+                UPDATE crawl_frontier SET state = 'pending', attempts = 0, next_attempt_at = 0
+                WHERE state = 'failed' AND attempts >= ?;
+            """, (FRONTIER_MAX_ATTEMPTS,))
+            if c.rowcount:
+                print(f"♻️ Requeued {c.rowcount} URLs that had run out of attempts.")
+        conn.commit()
+    finally:
+        conn.close()
+
+def frontier_counts(role):
+    conn = sqlite3.connect("jobs.db")
+    try:
+        return dict(conn.execute("""
+            SELECT state, COUNT(*) FROM crawl_frontier WHERE role = ? GROUP BY state;
+        """, (role,)).fetchall())
+    finally:
+        conn.close()
+
+def save_weekly_rollups(snapshot_date, rows):
+    # rows: (role, week, job_count, salary_sum, salary_count, with_salary_count); re-running on the same day
+    # replaces that day's snapshot, earlier days are never touched
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        create_rollups_table(c)
+        c.execute("DELETE FROM weekly_rollups WHERE snapshot_date = ?;", (snapshot_date,))
+        c.executemany("""
+            INSERT INTO weekly_rollups
+                (snapshot_date, role, week, job_count, salary_sum, salary_count, with_salary_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?);
+        """, [(snapshot_date, *row) for row in rows])
+        conn.commit()
+    finally:
+        conn.close()
+
+def load_weekly_rollups():
+    # A week stays visible in several daily snapshots and older postings expire from the
+    # site, so keep the fullest view of each (role, week) - preferring snapshots counted
+    # the way the dashboard counts (with_salary_count set) over older ones
+    conn = sqlite3.connect("jobs.db")
+    try:
+        create_rollups_table(conn.cursor())
+        conn.commit()
+        return conn.execute("""
+            SELECT role, week, job_count, salary_sum, salary_count, COALESCE(with_salary_count, salary_count)
+            FROM (
+                SELECT *, ROW_NUMBER() OVER (
+                    PARTITION BY role, week
+                    ORDER BY with_salary_count IS NOT NULL DESC, job_count DESC
+                ) AS pick
+                FROM weekly_rollups
+            )
+            WHERE pick = 1
+            ORDER BY week, role;
+        """).fetchall()
+    except sqlite3.OperationalError:
+        # Read-only or locked database: show the current crawl only
+        return []
+    finally:
+        conn.close()
+
+JOB_COLUMNS = ("title", "company", "experience", "salary", "location", "description", "url", "role", "skills",
+               "posted_date")
+
+def upsert_jobs(jobs):
+    # Re-extracted rows replace the stored fields of an existing URL instead of being ignored.
+    # role stays as first crawled: raw_pages keeps the latest role, so re-extraction would
+    # otherwise move a posting found under several roles to whichever was crawled last
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    columns = ", ".join(JOB_COLUMNS)
+    placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+    updates = ", ".join(f"{col} = excluded.{col}" for col in JOB_COLUMNS if col not in ("url", "role"))
+
+    try:
+        c.executemany(f"""
+            INSERT INTO jobs ({columns}) VALUES ({placeholders})
+            ON CONFLICT(url) DO UPDATE SET {updates};
+        """, [tuple(job[col] for col in JOB_COLUMNS) for job in jobs])
+        conn.commit()
+        return len(jobs)
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Error upserting {len(jobs)} jobs: {e}")
+        return 0
+    finally:
+        conn.close()
+
+def record_raw_page(url, role, path):
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        c.execute("""
+            INSERT INTO raw_pages (url, role, path, fetched_at) VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(url) DO UPDATE SET role = excluded.role, path = excluded.path,
+                                           fetched_at = excluded.fetched_at;
+        """, (url, role, path))
+        conn.commit()
+    except Exception as e:
+        print(f"❌ Error recording raw page: {e}")
+    finally:
+        conn.close()
+
+def get_raw_pages(role=None):
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        if role:
+            return c.execute("SELECT url, role, path FROM raw_pages WHERE role = ?;", (role,)).fetchall()
+        return c.execute("SELECT url, role, path FROM raw_pages;").fetchall()
+    finally:
+        conn.close()
+
+FTS_MIN_PREFIX = 3
+
+def build_fts_query(keywords):
+    # Quote every term so user input can't inject FTS5 syntax. Terms without a letter
+    # or digit produce no tokens and would match nothing, so they are dropped.
+    terms = [t.replace('"', '""') for t in str(keywords).split() if re.search(r'[^\W_]', t)]
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    # The last term is a prefix match (search-as-you-type), but only when it ends in a
+    # word of FTS_MIN_PREFIX+ characters: "c++" is tokenized as "c", and "c"* matches
+    # most of the table
+    last_word = re.search(r'([^\W_]+)$', terms[-1])
+    if last_word and len(last_word.group(1)) >= FTS_MIN_PREFIX:
+        quoted[-1] += "*"
+    return " AND ".join(quoted)
+
+def build_search_snapshot(rows, path=SEARCH_INDEX_PATH):
+    # Standalone FTS5 index over (url, title, description, skills) rows of one cleaned
+    # dataset. Built next to the CSV, it always describes the rows the dashboard has
+    # loaded, whatever happens to 'jobs' (e.g. a --fresh crawl refilling it).
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE job_search USING fts5(
+                url UNINDEXED,
+                title,
+                description,
+                skills,
+                tokenize='unicode61 remove_diacritics 2'
+            );
+        """)
+        conn.executemany("INSERT INTO job_search (url, title, description, skills) VALUES (?, ?, ?, ?);", rows)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+def search_job_urls(keywords, limit=None, index_path=SEARCH_INDEX_PATH):
+    # Matches are returned as URLs, the key the cleaned CSV shares with 'jobs'
+    query = build_fts_query(keywords)
+    if query is None:
+        return None
+    if not os.path.exists(index_path):
+        # No cleaning run has written the snapshot index yet: search the live table
+        return _search_live_jobs(query, limit)
+
+    conn = sqlite3.connect(index_path)
+    try:
+        sql = "SELECT url FROM job_search WHERE job_search MATCH ?"
+        params = [query]
+        if limit:
+            # Ranking is only worth its cost when the caller wants the best N hits
+            sql += " ORDER BY rank LIMIT ?"
+            params.append(int(limit))
+        return [row[0] for row in conn.execute(sql, params).fetchall()]
+    finally:
+        conn.close()
+
+def _search_live_jobs(query, limit=None):
+    # Live 'jobs' rows can differ from the loaded CSV, and are empty or partial
+    # while a --fresh crawl refills the table
+    conn = sqlite3.connect("jobs.db")
+    c = conn.cursor()
+
+    try:
+        sql = """
+            SELECT jobs.url FROM jobs_fts JOIN jobs ON jobs.id = jobs_fts.rowid
+            WHERE jobs_fts MATCH ?
+        """
+        params = [query]
+        if limit:
+            sql += " ORDER BY jobs_fts.rank LIMIT ?"
+            params.append(int(limit))
+        try:
+            rows = c.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            if "no such table" not in str(e):
+                raise
+            # Database predates the search index: build it once, then retry
+            create_search_index(c)
+            conn.commit()
+            rows = c.execute(sql, params).fetchall()
+        return [row[0] for row in rows]
     finally:
         conn.close()
@@ -0,0 +1,164 @@
+# dedup_jobs.py
+
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+SHINGLE_SIZE = 3
+THRESHOLD = 0.8
+TITLE_THRESHOLD = 0.8
+
+# Descriptions this short ("read more", "Role & responsibilities") or repeated
+# verbatim across this many companies (the site's IEIL disclaimer) say nothing
+# about the job, so their rows are never clustered
+MIN_DESCRIPTION_TOKENS = 20
+BOILERPLATE_MIN_COMPANIES = 3
+# Naukri's disclaimer, scraped instead of the description on many pages
+SITE_BOILERPLATE = ("ieil has taken all reasonable steps",)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _tokens(text):
+    if not isinstance(text, str):
+        return []
+    return re.findall(r'[a-z0-9+#]+', text.lower())
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    tokens = _tokens(text)
+    if len(tokens) <= k:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set),
+                             dtype=np.uint64, count=len(shingle_set))
+        # (a * h + b) mod p, one universal hash per permutation; uint64 wrap-around is intended
+        with np.errstate(over='ignore'):
+            permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=0)
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+def _normalize(text):
+    if not isinstance(text, str) or text.strip() in ("", "N/A"):
+        return ""
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
+
+def _location_key(location):
+    # Same set of cities, whatever the order or repeats
+    return ",".join(sorted({part.strip() for part in _normalize(location).split(",") if part.strip()}))
+
+
+def informative_descriptions(companies, descriptions):
+    """Flag the rows whose description can tell one job from another."""
+    desc_keys = [_normalize(d) for d in descriptions]
+    companies_per_desc = defaultdict(set)
+    for company, desc in zip(companies, desc_keys):
+        companies_per_desc[desc].add(_normalize(company))
+    return [
+        bool(desc) and len(_tokens(desc)) >= MIN_DESCRIPTION_TOKENS
+        and len(companies_per_desc[desc]) < BOILERPLATE_MIN_COMPANIES
+        and not desc.startswith(SITE_BOILERPLATE)
+        for desc in desc_keys
+    ]
+
+
+def _title_similarity(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate_clusters(ids, titles, companies, descriptions, experiences, locations,
+                            threshold=THRESHOLD, bands=BANDS, num_perm=NUM_PERM):
+    """Group near-duplicate postings and return one cluster ID per input row.
+
+    Rows are MinHashed on title + company + description shingles and bucketed
+    band by band (LSH), so only rows sharing a bucket are ever compared. A
+    candidate pair is a duplicate when it has the same company, experience
+    range and locations, similar titles and an estimated Jaccard similarity of
+    at least ``threshold``. Rows with a missing or boilerplate description
+    (see informative_descriptions) always form a cluster of their own.
+    The cluster ID is the smallest row ID in the cluster.
+    """
+    n = len(ids)
+    rows = num_perm // bands
+    hasher = MinHasher(num_perm)
+
+    # Rows can only ever share a bucket when all of these match exactly
+    group_keys = [
+        (_normalize(c), _normalize(e), _location_key(loc))
+        for c, e, loc in zip(companies, experiences, locations)
+    ]
+    informative = informative_descriptions(companies, descriptions)
+    title_tokens = [set(_tokens(t)) for t in titles]
+    signatures = np.vstack([
+        hasher.signature(shingles(f"{t} {c} {d}"))
+        for t, c, d in zip(titles, companies, descriptions)
+    ]) if n else np.empty((0, num_perm), dtype=np.uint64)
+
+    uf = _UnionFind(n)
+    for band in range(bands):
+        buckets = defaultdict(list)
+        band_sigs = signatures[:, band * rows:(band + 1) * rows]
+        for i in range(n):
+            if informative[i]:
+                buckets[(group_keys[i], band_sigs[i].tobytes())].append(i)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            # Compare each member against one representative per cluster already in
+            # the bucket rather than against every other member
+            representatives = {}
+            for i in members:
+                root = uf.find(i)
+                if root in representatives:
+                    continue
+                for j in list(representatives.values()):
+                    if _title_similarity(title_tokens[i], title_tokens[j]) < TITLE_THRESHOLD:
+                        continue
+                    if np.count_nonzero(signatures[i] == signatures[j]) >= threshold * num_perm:
+                        uf.union(i, j)
+                        break
+                else:
+                    representatives[root] = i
+
+    cluster_min_id = {}
+    for i in range(n):
+        root = uf.find(i)
+        cluster_min_id[root] = min(cluster_min_id.get(root, ids[i]), ids[i])
+    return [cluster_min_id[uf.find(i)] for i in range(n)]
@@ -0,0 +1,17 @@
+# gunicorn.conf.py - picked up automatically by `gunicorn dashboard_app:server` (see Procfile)
+
+# Import the app (and load the dataset) once in the master, so forked workers
+# start with the snapshot and its pre-rendered views already in memory
+preload_app = True
+
+
+def when_ready(server):
+    import dashboard_app
+    dashboard_app.warm_up()
+
+
+def post_fork(server, worker):
+    # Start the worker's dataset watcher at boot rather than on its first request, so
+    # a worker respawned long after the master loaded the data catches up right away
+    import data_store
+    data_store.get_snapshot()
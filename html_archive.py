@@ -0,0 +1,53 @@
+# html_archive.py
+
+import gzip
+import hashlib
+import os
+
+# zstd compresses job pages better and decompresses faster; gzip is the stdlib fallback
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ARCHIVE_DIR = os.environ.get("HTML_ARCHIVE_DIR", "html_archive")
+
+
+def url_hash(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def archive_path(url, root=ARCHIVE_DIR):
+    # Content-addressed by URL: <root>/ab/abcdef....html.zst
+    digest = url_hash(url)
+    ext = ".html.zst" if zstandard is not None else ".html.gz"
+    return os.path.join(root, digest[:2], digest + ext)
+
+
+def save_page(url, html, root=ARCHIVE_DIR):
+    path = archive_path(url, root)
+    data = html.encode("utf-8")
+    if path.endswith(".zst"):
+        data = zstandard.ZstdCompressor(level=10).compress(data)
+    else:
+        data = gzip.compress(data, compresslevel=6)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write then rename so a crash never leaves a truncated page behind
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_page(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"'zstandard' is required to read {path}")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return data.decode("utf-8")
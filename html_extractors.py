@@ -0,0 +1,284 @@
+# html_extractors.py
+
+import os
+import re
+
+from bs4 import BeautifulSoup
+
+# Fast parser backends are optional; BeautifulSoup stays as the reference implementation
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
+TITLE_CLASS = "styles_jd-header-title__rZwM1"
+WFH_LINK_CLASS = "styles_jhc__wfhmode-link__aHmrK"
+LOCATION_BLOCK_CLASS = "styles_jhc__loc___Du2H"
+SKILLS_HEADING_CLASS = "styles_heading__veHpg"
+
+POSTED_LABEL = re.compile(r"Posted", re.I)
+
+
+def _is_salary_text(text):
+    text = text.lower()
+    return "lacs" in text or "disclosed" in text
+
+
+def _or_na(value):
+    return "N/A" if value is None else value
+
+
+def _build_job(job_title, company_name, experience, salary, description, all_locations,
+               remote_explicit, posted_date, skills, job_url):
+    if remote_explicit:
+        location = "Remote"
+    elif all_locations:
+        unique_locations = list(dict.fromkeys(all_locations))
+        location = ', '.join(unique_locations)
+    else:
+        location = "N/A"
+
+    return {
+        "title": job_title,
+        "company": company_name,
+        "experience": experience,
+        "salary": salary,
+        "location": location,
+        "description": description,
+        "url": job_url,
+        "skills": ', '.join(skills) if skills else "N/A",
+        "posted_date": posted_date
+    }
+
+
+# --- BeautifulSoup (html.parser) ---
+def extract_bs4(html, job_url):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    job_title_elem = soup.select_one(f"h1.{TITLE_CLASS}")
+    job_title = job_title_elem.text.strip() if job_title_elem else "N/A"
+
+    company_elem = soup.select_one("a[title$='Careers']")
+    company_name = company_elem.text.strip() if company_elem else "N/A"
+
+    exp_elem = soup.find("span", string=lambda x: x and "year" in x.lower())
+    experience = exp_elem.text.strip() if exp_elem else "N/A"
+
+    salary = "N/A"
+    for span in soup.find_all("span"):
+        if _is_salary_text(span.text):
+            salary = span.text.strip()
+            break
+
+    desc_elem = soup.find("p")
+    description = desc_elem.text.strip() if desc_elem else "N/A"
+
+    all_locations = [link.text.strip() for link in soup.select('a[title*="Jobs in"]')]
+
+    remote_explicit = False
+    remote_link = soup.select_one(f'a.{WFH_LINK_CLASS}')
+    if remote_link and 'remote' in remote_link.text.strip().lower():
+        remote_explicit = True
+
+    remote_location_block = soup.select_one(f'div.{LOCATION_BLOCK_CLASS}')
+    remote_location_text_elem = remote_location_block.select_one('a') if remote_location_block else None
+    if remote_location_text_elem and 'remote' in remote_location_text_elem.text.strip().lower():
+        remote_explicit = True
+
+    posted_date = "N/A"
+    label_elem = soup.find("label", string=POSTED_LABEL)
+    posted_span = label_elem.find_next("span") if label_elem else None
+    if posted_span:
+        posted_date = posted_span.text.strip()
+
+    skills = [span.text.strip() for span in soup.select(f'div.{SKILLS_HEADING_CLASS} + div a span')]
+
+    return _build_job(job_title, company_name, experience, salary, description, all_locations,
+                      remote_explicit, posted_date, skills, job_url)
+
+
+# --- lxml ---
+def _has_class(el, class_name):
+    return class_name in (el.get("class") or "").split()
+
+
+def _lxml_string(el):
+    # Mirrors BeautifulSoup's Tag.string: the text of a node with exactly one child
+    children = list(el)
+    if not children:
+        return el.text
+    if len(children) == 1 and not el.text and not children[0].tail:
+        child = children[0]
+        return _lxml_string(child) if isinstance(child.tag, str) else child.text
+    return None
+
+
+def extract_lxml(html, job_url):
+    root = lxml_html.document_fromstring(html)
+
+    job_title = company_name = experience = salary = description = posted_date = None
+    all_locations = []
+    remote_explicit = False
+    wfh_checked = location_block_checked = after_posted_label = False
+
+    # One pass in document order picks up every field that "first match wins"
+    for el in root.iter():
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+
+        if tag == "span":
+            if after_posted_label and posted_date is None:
+                posted_date = el.text_content().strip()
+            if experience is None:
+                string = _lxml_string(el)
+                if string and "year" in string.lower():
+                    experience = el.text_content().strip()
+            if salary is None:
+                text = el.text_content()
+                if _is_salary_text(text):
+                    salary = text.strip()
+        elif tag == "a":
+            title_attr = el.get("title")
+            if title_attr is not None:
+                if company_name is None and title_attr.endswith("Careers"):
+                    company_name = el.text_content().strip()
+                if "Jobs in" in title_attr:
+                    all_locations.append(el.text_content().strip())
+            if not wfh_checked and _has_class(el, WFH_LINK_CLASS):
+                wfh_checked = True
+                if 'remote' in el.text_content().strip().lower():
+                    remote_explicit = True
+        elif tag == "p":
+            if description is None:
+                description = el.text_content().strip()
+        elif tag == "label":
+            if not after_posted_label:
+                string = _lxml_string(el)
+                if string and POSTED_LABEL.search(string):
+                    after_posted_label = True
+        elif tag == "h1":
+            if job_title is None and _has_class(el, TITLE_CLASS):
+                job_title = el.text_content().strip()
+        elif tag == "div":
+            if not location_block_checked and _has_class(el, LOCATION_BLOCK_CLASS):
+                location_block_checked = True
+                link = next(el.iter("a"), None)
+                if link is not None and 'remote' in link.text_content().strip().lower():
+                    remote_explicit = True
+
+    skills = [
+        span.text_content().strip()
+        for span in root.xpath(
+            f"//div[contains(concat(' ', normalize-space(@class), ' '), ' {SKILLS_HEADING_CLASS} ')]"
+            "/following-sibling::*[1][self::div]//a//span"
+        )
+    ]
+
+    return _build_job(_or_na(job_title), _or_na(company_name), _or_na(experience), _or_na(salary),
+                      _or_na(description), all_locations, remote_explicit, _or_na(posted_date),
+                      skills, job_url)
+
+
+# --- selectolax (lexbor) ---
+def _node_string(node):
+    children = list(node.iter(include_text=True))
+    if len(children) != 1:
+        return None
+    child = children[0]
+    if child.tag.startswith("-"):
+        return child.text(deep=False)
+    return _node_string(child)
+
+
+def _node_has_class(node, class_name):
+    return class_name in (node.attributes.get("class") or "").split()
+
+
+def extract_selectolax(html, job_url):
+    tree = SelectolaxParser(html)
+
+    job_title = company_name = experience = salary = description = posted_date = None
+    all_locations = []
+    remote_explicit = False
+    wfh_checked = location_block_checked = after_posted_label = False
+
+    for node in tree.root.traverse(include_text=False):
+        tag = node.tag
+
+        if tag == "span":
+            if after_posted_label and posted_date is None:
+                posted_date = node.text().strip()
+            if experience is None:
+                string = _node_string(node)
+                if string and "year" in string.lower():
+                    experience = node.text().strip()
+            if salary is None:
+                text = node.text()
+                if _is_salary_text(text):
+                    salary = text.strip()
+        elif tag == "a":
+            title_attr = node.attributes.get("title")
+            if title_attr is not None:
+                if company_name is None and title_attr.endswith("Careers"):
+                    company_name = node.text().strip()
+                if "Jobs in" in title_attr:
+                    all_locations.append(node.text().strip())
+            if not wfh_checked and _node_has_class(node, WFH_LINK_CLASS):
+                wfh_checked = True
+                if 'remote' in node.text().strip().lower():
+                    remote_explicit = True
+        elif tag == "p":
+            if description is None:
+                description = node.text().strip()
+        elif tag == "label":
+            if not after_posted_label:
+                string = _node_string(node)
+                if string and POSTED_LABEL.search(string):
+                    after_posted_label = True
+        elif tag == "h1":
+            if job_title is None and _node_has_class(node, TITLE_CLASS):
+                job_title = node.text().strip()
+        elif tag == "div":
+            if not location_block_checked and _node_has_class(node, LOCATION_BLOCK_CLASS):
+                location_block_checked = True
+                link = node.css_first("a")
+                if link is not None and 'remote' in link.text().strip().lower():
+                    remote_explicit = True
+
+    skills = [span.text().strip() for span in tree.css(f"div.{SKILLS_HEADING_CLASS} + div a span")]
+
+    return _build_job(_or_na(job_title), _or_na(company_name), _or_na(experience), _or_na(salary),
+                      _or_na(description), all_locations, remote_explicit, _or_na(posted_date),
+                      skills, job_url)
+
+
+EXTRACTORS = {"bs4": extract_bs4}
+if lxml_html is not None:
+    EXTRACTORS["lxml"] = extract_lxml
+if SelectolaxParser is not None:
+    EXTRACTORS["selectolax"] = extract_selectolax
+
+# Fastest installed backend unless EXTRACTOR_BACKEND says otherwise
+DEFAULT_BACKEND = os.environ.get(
+    "EXTRACTOR_BACKEND",
+    next(name for name in ("selectolax", "lxml", "bs4") if name in EXTRACTORS)
+)
+
+
+def extract_job_details(html, job_url, backend=None):
+    backend = backend or DEFAULT_BACKEND
+    try:
+        extractor = EXTRACTORS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown or unavailable extractor backend '{backend}'. "
+                         f"Available: {', '.join(EXTRACTORS)}") from None
+    return extractor(html, job_url)
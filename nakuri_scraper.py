@@ -6,15 +6,37 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import argparse
 import time
-import re
 
-from db_utils import create_database, insert_job
+from crawl_metrics import CrawlMetrics
+from db_utils import (
+    claim_frontier,
+    complete_frontier,
+    create_database,
+    enqueue_frontier,
+    fail_frontier,
+    frontier_counts,
+    insert_job,
+    next_frontier_retry,
+    record_raw_page,
+    release_frontier,
+    reset_frontier,
+)
+from html_archive import save_page
+from html_extractors import extract_job_details
 
 # Your ChromeDriver path
 CHROMEDRIVER_PATH = r"D:\webdriver\chromedriver-win64\chromedriver-win64\chromedriver.exe"
 
+# Stage timings and counters for the current run (see crawl_metrics)
+metrics = CrawlMetrics()
+
+# A crashed browser is rebuilt at most this many times per run before giving up
+MAX_BROWSER_RESTARTS = 5
+browser_restarts = 0
+
 # Roles to scrape
 roles = [
     "Data Analyst",
@@ -29,144 +51,200 @@ roles = [
 
 ]
 
-def get_job_links(role, max_pages=5):
+def new_driver():
     options = Options()
     # options.add_argument('--headless')
     service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
+    return webdriver.Chrome(service=service, options=options)
 
-    job_links = []
+def session_alive(driver):
+    # Any round-trip fails once Chrome or its WebDriver session is gone
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+def restart_driver(driver, role):
+    global browser_restarts
+    browser_restarts += 1
+    if browser_restarts > MAX_BROWSER_RESTARTS:
+        raise RuntimeError(f"Browser crashed {browser_restarts} times, stopping the crawl")
+    print("💥 Browser session lost, starting a new one")
+    metrics.incr(role, "browser_restarts")
     try:
-        for page in range(1, max_pages + 1):
-            url = f"https://www.naukri.com/{role.replace(' ', '-')}-jobs-{page}?k={role.replace(' ', '%20')}"
-            print(f"🔗 Visiting: {url}")
-            driver.get(url)
-
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.title"))
-            )
-            time.sleep(2)
-
-            links = driver.find_elements(By.CSS_SELECTOR, "a.title")
-            page_links = [link.get_attribute("href") for link in links if link.get_attribute("href")]
-            print(f"✅ Found {len(page_links)} job links")
-            job_links.extend(page_links)
-
-            if len(page_links) < 20:
-                break
-
-    except Exception as e:
-        print(f"❌ Error getting job links for role '{role}' page {page}: {e}")
-    finally:
         driver.quit()
+    except Exception:
+        pass
+    with metrics.stage(role, "browser_start"):
+        return new_driver()
+
+def listing_url(role, page):
+    return f"https://www.naukri.com/{role.replace(' ', '-')}-jobs-{page}?k={role.replace(' ', '%20')}"
+
+def wait_for_retry(kind, role):
+    # Nothing claimable right now: sleep until the next backed-off URL is due, if any
+    retry_at = next_frontier_retry(kind, role)
+    if retry_at is None:
+        return False
+    delay = max(retry_at - time.time(), 0)
+    if delay:
+        print(f"⏳ Waiting {delay:.0f}s to retry failed {kind} pages for role '{role}'")
+        time.sleep(delay)
+    return True
 
-    return job_links
+def get_job_links(role, max_pages=5):
+    # Listing pages go through the frontier too: page N+1 is only queued once page N is done
+    enqueue_frontier("listing", role, listing_url(role, 1), page=1)
 
-def scrape_job_details(driver, job_url):
+    driver = None
     try:
-        driver.get(job_url)
-        time.sleep(2)
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        job_title_elem = soup.select_one("h1.styles_jd-header-title__rZwM1")
-        job_title = job_title_elem.text.strip() if job_title_elem else "N/A"
-
-        company_elem = soup.select_one("a[title$='Careers']")
-        company_name = company_elem.text.strip() if company_elem else "N/A"
-
-        exp_elem = soup.find("span", string=lambda x: x and "year" in x.lower())
-        experience = exp_elem.text.strip() if exp_elem else "N/A"
-
-        salary_elem = soup.find_all("span")
-        salary = "N/A"
-        for span in salary_elem:
-            if "lacs" in span.text.lower() or "disclosed" in span.text.lower():
-                salary = span.text.strip()
+        while True:
+            item = claim_frontier("listing", role)
+            if item is None:
+                if wait_for_retry("listing", role):
+                    continue
                 break
 
-        desc_elem = soup.find("p")
-        description = desc_elem.text.strip() if desc_elem else "N/A"
-
-        ### --- Location extraction ---
-        location_links = soup.select('a[title*="Jobs in"]')
-        all_locations = [link.text.strip() for link in location_links]
+            url, page, attempts = item
+            if attempts > 1:
+                metrics.incr(role, "retries")
+            try:
+                if driver is None:
+                    with metrics.stage(role, "browser_start"):
+                        driver = new_driver()
+                print(f"🔗 Visiting: {url}")
+                with metrics.stage(role, "listing_load"):
+                    driver.get(url)
+
+                with metrics.stage(role, "listing_wait"):
+                    try:
+                        WebDriverWait(driver, 15).until(
+                            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "a.title"))
+                        )
+                        time.sleep(2)
+                        has_results = True
+                    except TimeoutException:
+                        # Past the last results page. Page 1 always has results, so a
+                        # timeout there is a real failure and gets retried.
+                        if page == 1:
+                            raise
+                        has_results = False
+
+                links = driver.find_elements(By.CSS_SELECTOR, "a.title") if has_results else []
+                page_links = [link.get_attribute("href") for link in links if link.get_attribute("href")]
+            except Exception as e:
+                if isinstance(e, WebDriverException) and driver is not None and not session_alive(driver):
+                    release_frontier(role, url)
+                    metrics.page_done(role, "listing", url, "browser_lost", error=str(e)[:200])
+                    driver = restart_driver(driver, role)
+                    continue
+                print(f"❌ Error getting job links for role '{role}' page {page}: {e}")
+                fail_frontier(role, url, e)
+                metrics.page_done(role, "listing", url, "failed", error=str(e)[:200])
+                continue
 
-        remote_explicit = False
-        remote_link = soup.select_one('a.styles_jhc__wfhmode-link__aHmrK')
-        if remote_link and 'remote' in remote_link.text.strip().lower():
-            remote_explicit = True
-
-        remote_location_block = soup.select_one('div.styles_jhc__loc___Du2H')
-        remote_location_text_elem = remote_location_block.select_one('a') if remote_location_block else None
-        if remote_location_text_elem and 'remote' in remote_location_text_elem.text.strip().lower():
-            remote_explicit = True
+            print(f"✅ Found {len(page_links)} job links")
+            discovered = [("job", link, None) for link in page_links]
+            if len(page_links) >= 20 and page < max_pages:
+                discovered.append(("listing", listing_url(role, page + 1), page + 1))
+            with metrics.stage(role, "db_write"):
+                complete_frontier(role, url, discovered)
+            metrics.page_done(role, "listing", url, "ok", links=len(page_links))
+    finally:
+        if driver:
+            driver.quit()
 
-        if remote_explicit:
-            location = "Remote"
-        elif all_locations:
-            unique_locations = list(dict.fromkeys(all_locations))
-            location = ', '.join(unique_locations)
-        else:
-            location = "N/A"
-        posted_date = "N/A"
-        try:
-            label_elem = soup.find("label", string=re.compile(r"Posted", re.I))
-            if label_elem and label_elem.find_next("span"):
-                posted_date = label_elem.find_next("span").text.strip()
-        except Exception as e:
-            print(f"⚠️ Could not extract posted date: {e}")
-
-        ### --- Skills extraction ---
-        skills_spans = soup.select('div.styles_heading__veHpg + div a span')
-        skills = [span.text.strip() for span in skills_spans]
-        skills_string = ', '.join(skills) if skills else "N/A"
-        # --- Posted Date Extraction ---
-        posted_elem = soup.find('label', string=re.compile('Posted', re.I))
-        posted_text = "N/A"
-        if posted_elem:
-            sibling = posted_elem.find_next_sibling("span")
-            if sibling:
-                posted_text = sibling.text.strip()
-
-
-        return {
-            "title": job_title,
-            "company": company_name,
-            "experience": experience,
-            "salary": salary,
-            "location": location,
-            "description": description,
-            "url": job_url,
-            "skills": skills_string,
-            "posted_date": posted_date
-
-        }
+def scrape_job_details(driver, job_url, role=None):
+    try:
+        with metrics.stage(role, "page_load"):
+            driver.get(job_url)
+        with metrics.stage(role, "page_wait"):
+            time.sleep(2)
 
+        html = driver.page_source
+        # Keep the raw page so extractor fixes can be replayed without a recrawl
+        with metrics.stage(role, "archive"):
+            try:
+                record_raw_page(job_url, role, save_page(job_url, html))
+            except OSError as e:
+                print(f"⚠️ Could not archive page {job_url}: {e}")
     except Exception as e:
+        if isinstance(e, WebDriverException) and not session_alive(driver):
+            raise  # not this page's fault: the caller rebuilds the browser
         print(f"❌ Error scraping job at {job_url}: {e}")
         return None
 
-def main():
-    create_database(drop_existing=True)
-    options = Options()
-    # options.add_argument('--headless')
-    service = Service(CHROMEDRIVER_PATH)
-    driver = webdriver.Chrome(service=service, options=options)
-
-    for role in roles:
-        print(f"\n🔍 Scraping role: {role}")
-        job_links = get_job_links(role)
-        print(f"🌐 Scraping {len(job_links)} job pages for role: {role}")
+    try:
+        with metrics.stage(role, "parse"):
+            return extract_job_details(html, job_url)
+    except Exception as e:
+        metrics.incr(role, "parse_failures")
+        print(f"❌ Error parsing job at {job_url}: {e}")
+        return None
 
-        for url in job_links:
-            job_data = scrape_job_details(driver, url)
-            if job_data:
-                job_data['role'] = role
-                insert_job(job_data)
+def scrape_job_pages(driver, role):
+    while True:
+        item = claim_frontier("job", role)
+        if item is None:
+            if wait_for_retry("job", role):
+                continue
+            break
+
+        url, _, attempts = item
+        if attempts > 1:
+            metrics.incr(role, "retries")
+        try:
+            job_data = scrape_job_details(driver, url, role)
+        except WebDriverException as e:
+            # Requeue without charging an attempt, then carry on in a new browser
+            release_frontier(role, url)
+            metrics.page_done(role, "job", url, "browser_lost", error=str(e)[:200])
+            driver = restart_driver(driver, role)
+            continue
+        if job_data:
+            job_data['role'] = role
+            metrics.record_job(role, job_data)
+            with metrics.stage(role, "db_write"):
+                inserted = insert_job(job_data)
+                complete_frontier(role, url)
+            metrics.incr(role, "inserted" if inserted else "duplicates")
+            metrics.page_done(role, "job", url, "ok", inserted=inserted)
+        else:
+            fail_frontier(role, url, "scrape failed")
+            metrics.page_done(role, "job", url, "failed")
+    # Possibly a new browser: the caller keeps using (and eventually quits) this one
+    return driver
+
+def main(fresh=False, retry_failed=False):
+    # By default resume the crawl recorded in the frontier; --fresh starts a new one
+    create_database(drop_existing=fresh)
+    reset_frontier(clear=fresh, retry_failed=retry_failed)
+    with metrics.stage(None, "browser_start"):
+        driver = new_driver()
 
-    driver.quit()
+    try:
+        for role in roles:
+            print(f"\n🔍 Scraping role: {role}")
+            with metrics.stage(role, "role_total"):
+                get_job_links(role)
+                counts = frontier_counts(role)
+                print(f"🌐 Crawl frontier for role {role}: {counts}")
+
+                driver = scrape_job_pages(driver, role)
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        metrics.finish()
     print("\n✅ Scraping done and data saved to jobs.db!")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Crawl Naukri job postings into jobs.db")
+    parser.add_argument("--fresh", action="store_true",
+                        help="drop the jobs table and crawl frontier and start a new crawl")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="when resuming, give URLs that ran out of attempts another set of retries")
+    args = parser.parse_args()
+    main(fresh=args.fresh, retry_failed=args.retry_failed)
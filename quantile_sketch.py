@@ -0,0 +1,174 @@
+# quantile_sketch.py
+
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+
+SKETCH_PATH = os.environ.get("SALARY_SKETCH_PATH", "salary_sketches.json")
+SKETCH_K = 200
+# years_exp_with_salary only counts postings that also list a salary: the
+# dashboard's "Show only jobs with salary info" view
+SKETCH_METRICS = ("avg_salary", "years_exp", "years_exp_with_salary")
+
+# Segment location that stands for "any location": every posting counted once per role
+ALL_LOCATIONS = "*"
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Keeps O(k log n) values in a stack of compactors; an item at level h stands
+    for 2**h inputs. With k=200 rank error stays around 1% at any stream size.
+    """
+
+    def __init__(self, k=SKETCH_K):
+        self.k = k
+        self.n = 0
+        self.min = None
+        self.max = None
+        self.compactors = [[]]
+        self._rng = random.Random()
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        size = sum(len(c) for c in self.compactors)
+        while size >= sum(self._capacity(h) for h in range(len(self.compactors))):
+            for h, compactor in enumerate(self.compactors):
+                if len(compactor) >= self._capacity(h):
+                    if h + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    # Keep every other sorted item (random offset) one level up, at double weight
+                    compactor.sort()
+                    leftover = compactor.pop() if len(compactor) % 2 else None
+                    self.compactors[h + 1].extend(compactor[self._rng.random() < 0.5::2])
+                    self.compactors[h] = [] if leftover is None else [leftover]
+                    break
+            size = sum(len(c) for c in self.compactors)
+
+    def update(self, value):
+        if value is None or value != value:  # skip None/NaN
+            return
+        value = float(value)
+        self.n += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.compactors[0].append(value)
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for h, compactor in enumerate(other.compactors):
+            self.compactors[h].extend(compactor)
+        self.n += other.n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantiles(self, qs):
+        if self.n == 0:
+            return [None for _ in qs]
+        weighted = sorted((value, 2 ** h) for h, compactor in enumerate(self.compactors) for value in compactor)
+        values = [value for value, _ in weighted]
+        # Item i stands for ranks cumulative[i-1] .. cumulative[i]-1
+        cumulative = list(itertools.accumulate(weight for _, weight in weighted))
+        total = cumulative[-1]
+
+        def value_at(rank):
+            return values[min(bisect.bisect_right(cumulative, rank), len(values) - 1)]
+
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(self.min)
+                continue
+            if q >= 1:
+                results.append(self.max)
+                continue
+            # Linear interpolation between neighbouring ranks, as pandas' quantile() does,
+            # so a sketch that still holds every value gives the exact answer
+            position = q * (total - 1)
+            lower = int(position)
+            low, high = value_at(lower), value_at(min(lower + 1, total - 1))
+            results.append(low + (position - lower) * (high - low))
+        return results
+
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "min": self.min, "max": self.max, "compactors": self.compactors}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        sketch.compactors = [list(c) for c in data["compactors"]]
+        return sketch
+
+
+class SegmentSketches:
+    """KLL sketches of salary and experience per (role, location) segment."""
+
+    def __init__(self, k=SKETCH_K, metrics=SKETCH_METRICS):
+        self.k = k
+        self.metrics = tuple(metrics)
+        self.segments = {}  # (role, location) -> {metric: KLLSketch}
+
+    def _segment(self, role, location):
+        key = (role, location)
+        if key not in self.segments:
+            self.segments[key] = {metric: KLLSketch(self.k) for metric in self.metrics}
+        return self.segments[key]
+
+    def update(self, role, locations, values):
+        # One posting: counted once under ALL_LOCATIONS and once per city it lists
+        for location in [ALL_LOCATIONS, *dict.fromkeys(locations)]:
+            segment = self._segment(role, location)
+            for metric in self.metrics:
+                segment[metric].update(values.get(metric))
+
+    def merged(self, metric, roles=None, locations=None):
+        # Cost depends on the number of segments, never on the number of postings
+        locations = set(locations) if locations else {ALL_LOCATIONS}
+        roles = set(roles) if roles else None
+        sketch = KLLSketch(self.k)
+        for (role, location), segment in self.segments.items():
+            if location in locations and (roles is None or role in roles):
+                sketch.merge(segment[metric])
+        return sketch
+
+    def save(self, path=SKETCH_PATH):
+        payload = {
+            "k": self.k,
+            "metrics": list(self.metrics),
+            "segments": [
+                {"role": role, "location": location, **{m: s.to_dict() for m, s in segment.items()}}
+                for (role, location), segment in self.segments.items()
+            ],
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=SKETCH_PATH):
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        # Files written before a metric was added simply don't have it
+        store = cls(payload["k"], payload.get("metrics", ("avg_salary", "years_exp")))
+        for entry in payload["segments"]:
+            store.segments[(entry["role"], entry["location"])] = {
+                metric: KLLSketch.from_dict(entry[metric]) for metric in store.metrics
+            }
+        return store
@@ -0,0 +1,64 @@
+# reextract_jobs.py
+#
+# Re-runs the HTML extractor over the raw-page archive and upserts the results
+# into 'jobs', so a selector fix doesn't need a recrawl:
+#
+#   python reextract_jobs.py [--workers N] [--backend selectolax|lxml|bs4] [--role "Data Analyst"]
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from db_utils import create_database, get_raw_pages, upsert_jobs
+from html_archive import load_page
+from html_extractors import DEFAULT_BACKEND, EXTRACTORS, extract_job_details
+
+BATCH_SIZE = 500
+
+
+def reextract_page(args):
+    url, role, path, backend = args
+    try:
+        job_data = extract_job_details(load_page(path), url, backend)
+    except Exception as e:
+        print(f"❌ Error re-extracting {url}: {e}")
+        return None
+    job_data['role'] = role
+    return job_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-extract archived job pages into jobs.db")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="parser processes")
+    parser.add_argument("--backend", default=DEFAULT_BACKEND, choices=sorted(EXTRACTORS))
+    parser.add_argument("--role", help="only re-extract pages crawled for this role")
+    args = parser.parse_args()
+
+    create_database(drop_existing=False)
+    pages = get_raw_pages(args.role)
+    print(f"📦 Re-extracting {len(pages)} archived pages with {args.backend} on {args.workers} workers")
+
+    start = time.perf_counter()
+    tasks = [(url, role, path, args.backend) for url, role, path in pages]
+    batch, upserted, failed = [], 0, 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for job_data in pool.map(reextract_page, tasks, chunksize=64):
+            if job_data is None:
+                failed += 1
+                continue
+            batch.append(job_data)
+            if len(batch) >= BATCH_SIZE:
+                upserted += upsert_jobs(batch)
+                batch = []
+
+    if batch:
+        upserted += upsert_jobs(batch)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Upserted {upserted} jobs ({failed} failed) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# report_jobs.py
+
+import hashlib
+import html
+import io
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+REPORT_WORKERS = int(os.environ.get("REPORT_WORKERS", "1"))
+REPORT_CACHE_DIR = os.environ.get("REPORT_CACHE_DIR", "report_cache")
+REPORT_CACHE_SIZE = int(os.environ.get("REPORT_CACHE_SIZE", "64"))
+
+PREVIEW_ROWS = 20
+PREVIEW_COLUMNS = 6
+
+
+def report_key(dataset_version, *filters):
+    # Same dataset version + same filter set -> same report, whatever the selection order
+    normalized = [sorted(f) if isinstance(f, (list, tuple)) else f for f in filters]
+    payload = json.dumps([dataset_version, normalized], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def build_report_html(columns, rows, total):
+    header = "".join(f"<th>{html.escape(str(col))}</th>" for col in columns)
+    body = "".join(
+        f"<tr>{''.join(f'<td>{html.escape(str(val))}</td>' for val in row)}</tr>" for row in rows
+    )
+    return f"""
+    <h2>AI Job Market Filtered Report</h2>
+    <p>Total Records: {total}</p>
+    <table border="1" cellpadding="5" cellspacing="0">
+        <tr>{header}</tr>
+        {body}
+    </table>
+    """
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.pdf")
+
+
+def _prune_cache(cache_dir, keep):
+    paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".pdf")]
+    if len(paths) <= keep:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:-keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def render_report(key, columns, rows, total, cache_dir=REPORT_CACHE_DIR, cache_size=REPORT_CACHE_SIZE):
+    # Runs in a pool process: xhtml2pdf/reportlab are only ever imported there
+    from xhtml2pdf import pisa
+
+    pdf_stream = io.BytesIO()
+    status = pisa.CreatePDF(io.StringIO(build_report_html(columns, rows, total)), dest=pdf_stream)
+    if status.err:
+        raise RuntimeError(f"xhtml2pdf reported {status.err} error(s)")
+
+    # Cache on disk so every dashboard worker process can serve a repeat request
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _cache_path(key, cache_dir)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pdf_stream.getvalue())
+    os.replace(tmp_path, path)
+    _prune_cache(cache_dir, cache_size)
+    return path
+
+
+class ReportQueue:
+    """Local stand-in for a job queue: PDF renders run in a small process pool so
+    they never hold the GIL (or a gunicorn worker) that chart callbacks need."""
+
+    def __init__(self, max_workers=REPORT_WORKERS, cache_dir=REPORT_CACHE_DIR, cache_size=REPORT_CACHE_SIZE):
+        self.max_workers = max_workers
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self._pool = None
+        self._pool_pid = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # Created on first use, and again in any process forked after that
+        if self._pool is None or self._pool_pid != os.getpid():
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._pool_pid = os.getpid()
+            self._futures = {}
+        return self._pool
+
+    def cached(self, key):
+        try:
+            with open(_cache_path(key, self.cache_dir), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def is_pending(self, key):
+        with self._lock:
+            future = self._futures.get(key)
+            return future is not None and not future.done()
+
+    def submit(self, key, columns, rows, total):
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and not future.done():
+                return
+            self._futures[key] = self._get_pool().submit(
+                render_report, key, columns, rows, total, self.cache_dir, self.cache_size
+            )
+
+    def result(self, key):
+        """Return the PDF bytes once rendered, None while still pending.
+
+        Re-raises the render error if the job failed.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None and future.done():
+                del self._futures[key]
+                future.result()
+        return self.cached(key)